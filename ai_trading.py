@@ -1,42 +1,41 @@
+import threading
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 from market_data import get_historical_prices
+import model_registry
+import feature_engine
 
 def generate_features(df):
-    """Generate additional features from raw price data."""
-    df["price_change"] = df["price"].pct_change()
-    df["volatility"] = df["price"].rolling(window=3).std()
-    df["momentum"] = df["price"] - df["price"].shift(3)
-    df["SMA_5"] = df["price"].rolling(window=5).mean()
-    df["EMA_5"] = df["price"].ewm(span=5, adjust=False).mean()
-    df["RSI"] = compute_rsi(df["price"])
+    """Generate additional features from raw price data, returning a new DataFrame."""
+    features = feature_engine.compute_features(df["price"].to_numpy(dtype=float), rsi_method="sma")
     
-    df.fillna(method="bfill", inplace=True)  # Fill missing values
+    df = df.copy()
+    for name, values in feature_engine.backfill(features).items():  # Fill missing values
+        df[name] = values[:, 0]
     df["label"] = np.where(df["price_change"] > 0, 1, 0)
     return df
 
-def compute_rsi(prices, window=14):
-    """Compute the Relative Strength Index (RSI) for given prices."""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
+FEATURES = ["price_change", "volatility", "momentum", "SMA_5", "EMA_5", "RSI"]
+TRAINING_DAYS = 180
+
+_train_locks = {}  # coin -> lock held while checking, training and saving its model
+_train_locks_lock = threading.Lock()
 
 def train_model(crypto):
-    """Train a trading model using historical data."""
-    df = get_historical_prices(crypto, days=180)
+    """Train a trading model using historical data and store it in the model registry."""
+    # Deferred: scikit-learn takes seconds to import and is only needed when a model is (re)trained
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    df = get_historical_prices(crypto, days=TRAINING_DAYS)
     if df is None or df.empty:
         print(f"🚨 Error: No historical data returned for {crypto}")
         return None, None
     df = generate_features(df)
     
-    features = ["price_change", "volatility", "momentum", "SMA_5", "EMA_5", "RSI"]
     df.dropna(inplace=True)  # Drop any remaining NaNs
-    X = df[features]
+    X = df[FEATURES]
     y = df["label"]
     
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
@@ -46,24 +45,58 @@ def train_model(crypto):
     
     model = RandomForestClassifier(n_estimators=100, random_state=42)
     model.fit(X_train_scaled, y_train)
-    
+
+    model_registry.save_model(crypto, model, scaler, {
+        "training_days": TRAINING_DAYS,
+        "training_start": df.index[0].timestamp(),
+        "features": FEATURES,
+        "data_watermark": df.index[-1].timestamp(),
+        "test_accuracy": model.score(X_test_scaled, y_test),
+    })
     return model, scaler
 
+def _current_model(crypto, latest_timestamp):
+    """The registry's (model, scaler) for a coin, or None if it is missing or stale."""
+    entry = model_registry.load_model(crypto)
+    if entry is not None:
+        model, scaler, metadata = entry
+        if not model_registry.needs_retrain(metadata, FEATURES, latest_timestamp):
+            return model, scaler
+    return None
+
+def get_model(crypto, latest_timestamp=None):
+    """Return the warm (model, scaler) for a coin, retraining only when the registry says it is stale.
+
+    Retraining holds a per-coin lock, so concurrent callers wait for one training run instead of each starting their own.
+    """
+    current = _current_model(crypto, latest_timestamp)
+    if current is not None:
+        return current
+    with _train_locks_lock:
+        lock = _train_locks.setdefault(crypto, threading.Lock())
+    with lock:
+        current = _current_model(crypto, latest_timestamp)  # Another caller may have retrained it while we waited
+        if current is not None:
+            return current
+        return train_model(crypto)
+
 def predict_trade_signal(crypto):
     """Predict trade signal (Buy/Sell) using AI model."""
-    model, scaler = train_model(crypto)
     df = get_historical_prices(crypto, days=1)
     if df.empty:
         print(f"🚨 Error: No data retrieved for {crypto}.")
         return "Error: No data available"
     df = generate_features(df)
     
-    required_columns = ["price_change", "volatility", "momentum", "SMA_5", "EMA_5", "RSI"]
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in FEATURES if col not in df.columns]
     if missing_columns:
         print(f"🚨 Error: Missing columns {missing_columns} in DataFrame!")
         return f"Error: Missing required features {missing_columns}"
+
+    model, scaler = get_model(crypto, df.index[-1].timestamp())
+    if model is None:
+        return "Error: No trained model available"
     
-    latest_data = scaler.transform(df[required_columns].iloc[-1:].values)
+    latest_data = scaler.transform(df[FEATURES].iloc[-1:].values)
     prediction = model.predict(latest_data)
     return "BUY" if prediction[0] == 1 else "SELL"
@@ -1,46 +1,102 @@
 import streamlit as st
-import plotly.express as px
-import datetime
-import sqlite3
 import pandas as pd
-from wallet_tracker import detect_and_identify_wallets, get_wallet_balance
+from wallet_tracker import get_wallet_balance, ingest_new_transactions
+import config
+import data_cache
+import database
+import math
+import rate_limiter
+import snapshot_store
+from transaction_normalizer import chain_key
+import historical_tracking
 import time
-from trade_recommender import recommend_trade, execute_trade
-from notifications import send_email_alert, send_telegram_alert, send_discord_alert
-from user_tracking import register_new_user, load_users
-from backtesting_module import run_backtest
-from highest_spenders import identify_highest_spenders
-from spending_analysis import analyze_spending
-from market_data import get_historical_prices, get_crypto_prices, get_real_time_data
-from ai_trading import predict_trade_signal
-from datetime import date, timedelta
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
+from market_data import get_crypto_prices, get_real_time_data
+from datetime import date, datetime, timedelta
 from historical_tracking import get_historical_prices
-from wallet_analysis import analyze_spending
-import requests
-from dotenv import load_dotenv
-from risk_management import calculate_risk_metrics
+
+# Plotting, AI and analysis modules are imported inside the pages that use them,
+# so the sidebar renders without waiting on plotly or scikit-learn.
 
 st.set_page_config(page_title="Crypto Wallet Tracker", layout="wide")
+# Never sleep in the render thread waiting for a rate limit slot: an over-budget fetch fails fast
+# and load_data shows when its next slot is free; a rerun after that retries it
+rate_limiter.set_thread_max_wait(config.RATE_LIMIT_INTERACTIVE_MAX_WAIT)
 st.title("🚀 Blockchain Wallet Tracker & Transaction Analyzer 🚀")
 
-# Initialize Database
-def initialize_database():
-    conn = sqlite3.connect("wallet_tracking.db", check_same_thread=False)
-    cursor = conn.cursor()
-    cursor.execute('''CREATE TABLE IF NOT EXISTS wallets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        wallet_address TEXT,
-        blockchain TEXT,
-        total_received REAL,
-        transaction_count INTEGER,
-        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )''')
-    conn.commit()
-    conn.close()
-
-initialize_database()
+# Cached data functions: shared by every rerun and session, refreshed in the background before they expire
+get_crypto_prices = data_cache.cached("crypto_prices")(get_crypto_prices)
+get_real_time_data = data_cache.cached("real_time_data")(get_real_time_data)
+get_historical_prices = data_cache.cached("historical_prices")(get_historical_prices)
+
+@data_cache.cached("recent_prices")
+def get_recent_prices(coin_id, days):
+    """Prices for the last `days` days, cached per coin rather than per (ever-moving) end timestamp."""
+    end_timestamp = int(time.time())
+    return historical_tracking.get_historical_prices(coin_id, end_timestamp - days * 24 * 60 * 60, end_timestamp)
+
+@data_cache.cached("wallet_scan")
+def scan_wallets(chain):
+    """Ingest the explorer's latest transactions into the wallet database; None if the scan failed."""
+    new_transactions = ingest_new_transactions(chain)
+    return None if new_transactions is None else {"new_transactions": new_transactions}
+
+@data_cache.cached("wallet_counts")
+def get_wallet_counts(chain, recent, skip_dust, scanned_at):
+    """Cutoff for the `recent` most recently updated wallets and the wallet count per category under it.
+
+    scanned_at only keys the cache, so the counts are redone as soon as a new scan lands.
+    """
+    updated_since = database.recent_wallets_cutoff(chain, recent, skip_dust)
+    return {"updated_since": updated_since, "counts": database.count_wallets_by_category(chain, updated_since, skip_dust)}
+
+@data_cache.cached("wallet_charts")
+def get_wallet_chart_data(chain, category, updated_since, skip_dust):
+    """Top wallets and total-received histogram, aggregated in SQL so charts never get one bar per wallet."""
+    top_wallets = database.query_wallets(chain, category, updated_since, skip_dust, limit=config.WALLET_CHART_TOP_N)
+    return {"top_wallets": top_wallets, "histogram": database.wallet_histogram(chain, category, updated_since, skip_dust)}
+
+def read_snapshot(name, key=""):
+    """Latest snapshot published by precompute_daemon.py, or None if the daemon has not refreshed it lately."""
+    max_age = max(config.SNAPSHOT_MAX_AGE, 2 * config.PRECOMPUTE_INTERVALS.get(name, 0))
+    return snapshot_store.get_snapshot(name, key, max_age=max_age)
+
+def load_data(name, key, fetch, *args):
+    """Return (data, fetched_at) from the daemon's snapshot, falling back to the cached inline fetch without it."""
+    snapshot = read_snapshot(name, key)
+    if snapshot is not None:
+        return snapshot["data"], snapshot["created_at"]
+    try:
+        return fetch(*args), fetch.fetched_at(*args)
+    except rate_limiter.RateLimitExceeded as e:
+        st.info(f"⏳ {name.replace('_', ' ').capitalize()} is rate limited; refresh in {e.retry_in:.0f}s to retry.")
+        return None, None
+
+def show_data_as_of(fetched_at, container=st):
+    """Caption with the time the data on screen was fetched."""
+    if fetched_at:
+        container.caption(f"🕒 Data as of {datetime.fromtimestamp(fetched_at):%Y-%m-%d %H:%M:%S}")
+
+def show_wallet_table(chain, category, scope, key, total):
+    """Sortable, searchable wallet table paged in SQL; only the visible page is sent to the browser.
+
+    total is the category's (cached) wallet count; it is only recounted when a search narrows the table.
+    """
+    col1, col2, col3 = st.columns([2, 1, 2])
+    sort_by = col1.selectbox("Sort by", database.WALLET_SORT_COLUMNS, key=f"{key}_sort")
+    descending = col2.checkbox("Descending", value=True, key=f"{key}_descending")
+    search = col3.text_input("Search address", key=f"{key}_search").strip()
+
+    if search:
+        total = database.count_wallets(chain, category, search=search, **scope)
+    pages = max(1, math.ceil(total / config.WALLET_PAGE_SIZE))
+    # Keyed on the search and page count so a narrower result set starts again at page 1
+    page_number = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{key}_page_{search}_{pages}")
+    offset = (page_number - 1) * config.WALLET_PAGE_SIZE
+    rows = database.query_wallets(chain, category, search=search, sort_by=sort_by, descending=descending,
+                                  limit=config.WALLET_PAGE_SIZE, offset=offset, **scope)
+    st.dataframe(rows, hide_index=True)
+    if total:
+        st.caption(f"Wallets {offset + 1}–{offset + len(rows)} of {total}")
 
 # Mapping function to convert our selection to CoinGecko coin ID
 def get_coin_id(blockchain):
@@ -67,18 +123,26 @@ blockchain = st.sidebar.selectbox(
     key="sidebar_blockchain_select"
 )
 
+if st.sidebar.button("🔄 Refresh Data"):
+    data_cache.invalidate_all()
+
 # Display current cryptocurrency price
-crypto_prices = get_crypto_prices()
+crypto_prices, prices_as_of = load_data("crypto_prices", "", get_crypto_prices)
 if isinstance(crypto_prices, dict) and blockchain in crypto_prices:
     st.sidebar.metric(f"💲 {blockchain.capitalize()} Price", f"${crypto_prices.get(blockchain, {}).get('usd', 'N/A')}")
+    show_data_as_of(prices_as_of, st.sidebar)
 
-max_wallets = st.sidebar.slider("Number of Wallets to Retrieve", min_value=10, max_value=500, value=150)
+max_wallets = st.sidebar.slider("Number of Wallets to Retrieve", min_value=10, max_value=config.WALLET_TRACKING_MAX_WALLETS,
+                                value=150, step=10)
 filter_type = st.sidebar.radio("Filter by Wallet Type", ["all", "new", "potential"], index=0)
-skip_demo = st.sidebar.checkbox("Skip Demo Wallets (Low Balance)")
+skip_demo = st.sidebar.checkbox("Skip Demo Wallets (Low Balance)",
+                                help=f"Leave out receipts below {config.DUST_TRANSACTION_VALUE:g} and wallets that only received those")
 
 page = st.sidebar.radio("Go to", ["Home", "Wallet Tracking", "Historical Tracking","Wallet Analysis","AI Trading"])
 
 if page == "Home":
+    import plotly.express as px
+
     st.subheader("💰 Blockchain Balance & Real-Time Analytics")
     wallet_address = st.text_input("Enter Wallet Address")
     
@@ -89,26 +153,35 @@ if page == "Home":
         else:
             st.error("Invalid Wallet Address")
     
-    # Real-Time Analytics (Only for Bitcoin)
-    if blockchain == "bitcoin":
-        st.subheader("📊 Real-Time Blockchain Analytics")
-        real_time_data = get_real_time_data(blockchain)
-        if isinstance(real_time_data, dict):
-            total_transactions = real_time_data.get("total_transactions", "N/A")
-            total_volume = real_time_data.get("total_volume", "N/A")
-            active_wallets = real_time_data.get("active_wallets", "N/A")
-            st.metric("Total Transactions", total_transactions)
-            st.metric("Total Volume", f"{total_volume} {blockchain.upper()}")
-            st.metric("Active Wallets", active_wallets)
-            
-            # Visualization
-            if isinstance(real_time_data.get("transactions"), list):
-                df = pd.DataFrame(real_time_data["transactions"])
-                if not df.empty and "timestamp" in df.columns and "value" in df.columns:
-                    df["timestamp"] = pd.to_datetime(df["timestamp"], unit='ms')
-                    st.subheader("📈 Real-Time Transaction Trends")
-                    fig = px.line(df, x="timestamp", y="value", title=f"Real-Time {blockchain.capitalize()} Transaction Volume")
-                    st.plotly_chart(fig)
+    # Real-Time Analytics
+    st.subheader("📊 Real-Time Blockchain Analytics")
+    real_time_data, real_time_as_of = load_data("real_time_data", chain_key(blockchain), get_real_time_data, blockchain)
+    if isinstance(real_time_data, dict):
+        show_data_as_of(real_time_as_of)
+        total_transactions = real_time_data.get("total_transactions", "N/A")
+        total_volume = real_time_data.get("total_volume", "N/A")
+        active_wallets = real_time_data.get("active_wallets", "N/A")
+        st.metric("Total Transactions", total_transactions)
+        st.metric("Total Volume", f"{total_volume} {blockchain.upper()}")
+        st.metric("Active Wallets", active_wallets)
+        if real_time_data.get("top_addresses"):
+            st.dataframe(pd.DataFrame(real_time_data["top_addresses"], columns=["Address", "Estimated Volume"]))
+        
+        # Visualization
+        if isinstance(real_time_data.get("transactions"), list):
+            df = pd.DataFrame(real_time_data["transactions"])
+            if not df.empty and "timestamp" in df.columns and "value" in df.columns:
+                df["timestamp"] = pd.to_datetime(df["timestamp"], unit='ms')
+                st.subheader("📈 Real-Time Transaction Trends")
+                fig = px.line(df, x="timestamp", y="value", title=f"Real-Time {blockchain.capitalize()} Transaction Volume")
+                st.plotly_chart(fig)
+
+    # Rolling leaderboard, only kept live by the precompute daemon
+    leaderboard = read_snapshot("leaderboard", f"{chain_key(blockchain)}:24h")
+    if leaderboard:
+        st.subheader("🔥 Top Spenders (Last 24 Hours)")
+        show_data_as_of(leaderboard["created_at"])
+        st.dataframe(pd.DataFrame(leaderboard["data"]).head(10))
 
 
 # Last 24 Hours Price Trend Graph
@@ -120,14 +193,12 @@ if page == "Home":
     if not coin_id:
         st.error(f"Error: Could not fetch CoinGecko ID for {blockchain}")
     else:
-    # Calculate timestamps
-        end_timestamp = int(time.time())  # Current time in seconds
         days = 7 if blockchain in ["solana", "binancecoin"] else 1
-        start_timestamp = end_timestamp - (days * 24 * 60 * 60)  # Subtract days in seconds
 
     # Fetch historical price data
         try:
-            historical_data = get_historical_prices(coin_id, start_timestamp, end_timestamp)
+            historical_data, history_as_of = load_data("recent_prices", f"{coin_id}:{days}", get_recent_prices, coin_id, days)
+            show_data_as_of(history_as_of)
 
             if isinstance(historical_data, pd.DataFrame) and not historical_data.empty:
                 fig = px.line(historical_data, x="timestamp", y="price",
@@ -139,28 +210,39 @@ if page == "Home":
             st.error(f"Error retrieving price data: {e}")
 
 elif page == "Wallet Tracking":
+    import plotly.express as px
+
     st.subheader("💰 Enhanced Wallet Tracking & Visualization")
     
-    wallet_data = detect_and_identify_wallets(blockchain, max_wallets, filter_type, skip_demo)
-    if wallet_data and "all_wallets" in wallet_data:
+    # Keep the wallet database current (the daemon does this when running), then query it page by page
+    chain = chain_key(blockchain)
+    _, wallets_as_of = load_data("tracked_wallets", chain, scan_wallets, chain)
+    show_data_as_of(wallets_as_of)
+    # The recent-wallets cutoff and every tab's count are resolved once per scan, not per widget
+    summary = get_wallet_counts(chain, max_wallets, skip_demo, wallets_as_of)
+    counts = summary["counts"]
+    scope = {"updated_since": summary["updated_since"], "skip_dust": skip_demo}
+    if counts["all"]:
         st.subheader("📊 Wallet Data Visualization & Insights")
         tab1, tab2, tab3 = st.tabs(["All Wallets", "New Wallets", "Repeated Buyers"])
         with tab1:
-            st.metric("Total Wallets Found", len(wallet_data["all_wallets"]))
-            # Convert to DataFrame for visualization purposes
-            df_all = pd.DataFrame(wallet_data["all_wallets"])
-            st.dataframe(df_all)
-            # Bar Chart: Total Received by each Wallet (if data available)
-            if not df_all.empty and "wallet_address" in df_all.columns and "total_received" in df_all.columns:
-                fig = px.bar(df_all, x="wallet_address", y="total_received", color="transaction_count",
-                             title="Total Received by Wallets")
+            st.metric("Total Wallets Found", counts[filter_type])
+            show_wallet_table(chain, filter_type, scope, "all_wallets", counts[filter_type])
+            # Charts get pre-aggregated top-N and histogram data, not one bar per wallet
+            chart_data = get_wallet_chart_data(chain, filter_type, scope["updated_since"], scope["skip_dust"])
+            if not chart_data["top_wallets"].empty:
+                fig = px.bar(chart_data["top_wallets"], x="wallet_address", y="total_received", color="transaction_count",
+                             title=f"Top {len(chart_data['top_wallets'])} Wallets by Total Received")
+                st.plotly_chart(fig)
+                fig = px.bar(chart_data["histogram"], x="bucket", y="wallets", hover_data=["total_received"],
+                             title="Wallets by Total Received")
                 st.plotly_chart(fig)
         with tab2:
-            st.metric("New Wallets Found", len(wallet_data["potential_new_wallets"]))
-            st.dataframe(pd.DataFrame(wallet_data["potential_new_wallets"]))
+            st.metric("New Wallets Found", counts["new"])
+            show_wallet_table(chain, "new", scope, "new_wallets", counts["new"])
         with tab3:
-            st.metric("Repeated Buyers Detected", len(wallet_data["potential_repeated_buyers"]))
-            st.dataframe(pd.DataFrame(wallet_data["potential_repeated_buyers"]))
+            st.metric("Repeated Buyers Detected", counts["potential"])
+            show_wallet_table(chain, "potential", scope, "repeated_buyers", counts["potential"])
     else:
         st.warning("No wallet data found on this blockchain.")
 
@@ -168,6 +250,8 @@ elif page == "AI Trading":
     st.subheader("📈 AI Trading Predictions")
     wallet_address = st.text_input("Enter Wallet Address")
     if st.button("Get AI Trade Signal") and wallet_address:
+        from ai_trading import predict_trade_signal
+
         signal = predict_trade_signal(blockchain)
         if signal:
             st.success(f"🛖 Trade Signal: **{signal}** for {blockchain.upper()}")
@@ -180,6 +264,9 @@ elif page == "AI Trading":
 # 📊 Historical Price Tracking
 # ==============================
 elif page == "Historical Tracking":
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.sidebar.subheader("📈 Historical Price Tracking")
     
     # User Inputs for Crypto Price Analysis
@@ -202,18 +289,9 @@ elif page == "Historical Tracking":
             mapping = {"bitcoin": "bitcoin", "ethereum": "ethereum", "solana": "solana", "binancecoin": "binancecoin"}
             return mapping.get(crypto.lower(), "bitcoin")
 
-        def get_historical_prices(coin_id, start_timestamp, end_timestamp):
-            url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart/range?vs_currency=usd&from={start_timestamp}&to={end_timestamp}"
-            response = requests.get(url)
-            data = response.json()
-            if "prices" in data:
-                df = pd.DataFrame(data["prices"], columns=["timestamp", "price"])
-                df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-                return df
-            return pd.DataFrame()
-
         coin_id = get_coin_id(blockchain)
-        historical_data = get_historical_prices(coin_id, start_timestamp, end_timestamp)
+        historical_data = get_historical_prices(coin_id, start_timestamp, end_timestamp).copy()  # Cached; add columns to a copy
+        show_data_as_of(get_historical_prices.fetched_at(coin_id, start_timestamp, end_timestamp))
 
         if not historical_data.empty:
             fig = px.line(historical_data, x="timestamp", y="price", title=f"{blockchain.capitalize()} Price Trend")
@@ -234,6 +312,16 @@ elif page == "Historical Tracking":
             col3.metric("📊 Avg Price", f"${historical_data['price'].mean():.2f}")
             col4.metric("📉 % Change", f"{((historical_data['price'].iloc[-1] - historical_data['price'].iloc[0]) / historical_data['price'].iloc[0]) * 100:.2f}%")
 
+            risk = read_snapshot("risk_metrics", coin_id)
+            if risk:
+                metrics = risk["data"]
+                st.subheader(f"⚠️ Risk Metrics (Last {metrics['days']} Days)")
+                show_data_as_of(risk["created_at"])
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Sharpe Ratio", f"{metrics['sharpe_ratio']:.2f}" if metrics["sharpe_ratio"] is not None else "N/A")
+                col2.metric("Max Drawdown", f"{metrics['max_drawdown']:.2f}%" if metrics["max_drawdown"] is not None else "N/A")
+                col3.metric("Trailing Stop", f"${metrics['trailing_stop']:.2f}" if metrics["trailing_stop"] is not None else "N/A")
+
             # Export Data
             csv_data = historical_data.to_csv(index=False).encode("utf-8")
             st.download_button(label="⬇ Download CSV", data=csv_data, file_name=f"{blockchain}_historical_data.csv", mime="text/csv")
@@ -246,6 +334,9 @@ elif page == "Historical Tracking":
 # 💳 Wallet Spending Analysis
 # ==============================
 elif page == "Wallet Analysis":
+    import plotly.express as px
+    from wallet_analysis import analyze_spending
+
     st.sidebar.subheader("💳 Wallet Spending Analysis")
 
     # User Inputs for Wallet Analysis
@@ -1,6 +1,15 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
 import pandas as pd
 import numpy as np
 
+import config
+import price_store
+from feature_engine import rolling_mean
+
 def generate_fake_data():
     """Generate fake historical price data for backtesting."""
     dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
@@ -15,28 +24,153 @@ def simple_moving_average_strategy(data, short_window=5, long_window=20):
     data['Positions'] = data['Signal'].diff()
     return data
 
+def vectorized_backtest(prices, signals, initial_balance=1000, fee=0.0):
+    """Backtest all-in long/flat signals with array operations.
+
+    :param prices: 1-D array of prices
+    :param signals: 1-D array, or 2-D array shaped (time, strategy), of desired positions (1 = long, 0 = flat)
+    :param fee: fraction of equity paid on every fill
+    :return: dict with equity curve, positions, final balance, profit, trade count and max drawdown (%) per strategy
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    signals = np.asarray(signals)
+    single = signals.ndim == 1
+    if single:
+        signals = signals.reshape(-1, 1)
+    signals = signals > 0
+    n = len(prices)
+
+    # As in the original loop, only a 0 -> 1 transition is a buy, so a signal already on at the first bar is skipped
+    is_flat = ~signals
+    first_flat = np.where(is_flat.any(axis=0), is_flat.argmax(axis=0), n)
+    positions = signals & (np.arange(n)[:, None] >= first_flat)
+
+    returns = np.zeros(n)
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    fills = np.zeros(positions.shape, dtype=np.int64)
+    fills[1:] = positions[1:] != positions[:-1]
+
+    growth = np.ones(positions.shape)
+    growth[1:] += positions[:-1] * returns[1:, None]  # Held over bar i if long at the close of bar i-1
+    if fee:
+        growth *= (1 - fee) ** fills
+    equity = initial_balance * np.cumprod(growth, axis=0)
+
+    peak = np.maximum.accumulate(equity, axis=0)
+    result = {
+        "equity": equity,
+        "positions": positions,
+        "final_balance": equity[-1],
+        "profit": equity[-1] - initial_balance,
+        "trades": fills.sum(axis=0),
+        "max_drawdown": (equity / peak - 1).min(axis=0) * 100,
+    }
+    if single:
+        result = {key: value[:, 0] if value.ndim == 2 else value[0] for key, value in result.items()}
+    return result
+
 def run_backtest():
     """Run backtest and return results."""
     data = generate_fake_data()
     data = simple_moving_average_strategy(data)
     
     initial_balance = 1000  # USD
-    position = 0
-    balance = initial_balance
-    
-    for i in range(1, len(data)):
-        if data['Positions'].iloc[i] == 1:  # Buy Signal
-            position = balance / data['Price'].iloc[i]
-            balance = 0
-        elif data['Positions'].iloc[i] == -1 and position > 0:  # Sell Signal
-            balance = position * data['Price'].iloc[i]
-            position = 0
-    
-    final_balance = balance if balance > 0 else position * data['Price'].iloc[-1]
-    profit = final_balance - initial_balance
+    result = vectorized_backtest(data['Price'].to_numpy(), data['Signal'].to_numpy(), initial_balance)
     
     return {
-        "Final Balance": round(final_balance, 2),
-        "Profit/Loss": round(profit, 2),
-        "Trades Executed": data['Positions'].abs().sum()
+        "Final Balance": round(float(result["final_balance"]), 2),
+        "Profit/Loss": round(float(result["profit"]), 2),
+        "Trades Executed": int(result["trades"]),
+        "Max Drawdown": round(float(result["max_drawdown"]), 2)
     }
+
+def sma_crossover_signals(prices, params):
+    """Signals for many (short_window, long_window) pairs at once; each moving average is computed once."""
+    prices = np.asarray(prices, dtype=np.float64).reshape(-1, 1)
+    windows = {p["short_window"] for p in params} | {p["long_window"] for p in params}
+    averages = {window: rolling_mean(prices, window)[:, 0] for window in windows}
+    with np.errstate(invalid="ignore"):
+        return np.column_stack([averages[p["short_window"]] > averages[p["long_window"]] for p in params])
+
+def momentum_signals(prices, params):
+    """Long while the price is above its level `lookback` bars ago."""
+    prices = np.asarray(prices, dtype=np.float64)
+    signals = np.zeros((len(prices), len(params)), dtype=bool)
+    for i, p in enumerate(params):
+        lookback = p["lookback"]
+        signals[lookback:, i] = prices[lookback:] > prices[:-lookback]
+    return signals
+
+STRATEGIES = {
+    "sma_crossover": sma_crossover_signals,
+    "momentum": momentum_signals
+}
+
+WINDOW_PARAMS = {  # Bar counts each strategy needs to be at least 1
+    "sma_crossover": ("short_window", "long_window"),
+    "momentum": ("lookback",)
+}
+
+SWEEP_BYTES_PER_CELL = 48  # Peak working memory of vectorized_backtest per (bar, combination), measured at ~44
+
+def sweep_chunk_size(n_bars, memory_mb=None):
+    """Combinations per sweep chunk that keep one worker's arrays within memory_mb (config.SWEEP_CHUNK_MEMORY_MB)."""
+    memory_mb = memory_mb or config.SWEEP_CHUNK_MEMORY_MB
+    return max(1, memory_mb * 1024 * 1024 // (max(n_bars, 1) * SWEEP_BYTES_PER_CELL))
+
+def _run_sweep_chunk(prices, strategy, params, initial_balance, fee):
+    signals = STRATEGIES[strategy](prices, params)
+    result = vectorized_backtest(prices, signals, initial_balance, fee)
+    return [
+        dict(p, **{
+            "Final Balance": float(result["final_balance"][i]),
+            "Profit/Loss": float(result["profit"][i]),
+            "Trades Executed": int(result["trades"][i]),
+            "Max Drawdown": float(result["max_drawdown"][i])
+        })
+        for i, p in enumerate(params)
+    ]
+
+def run_parameter_sweep(prices, param_grid, strategy="sma_crossover", initial_balance=1000, fee=0.0, chunk_size=None, max_workers=None):
+    """Backtest every combination in param_grid across a process pool.
+
+    :param prices: 1-D array of prices, e.g. from load_price_history
+    :param param_grid: dict of parameter name -> list of values, e.g. {"short_window": [5, 10], "long_window": [20, 50]}
+    :param chunk_size: combinations per worker task; by default sized from the price history (see sweep_chunk_size)
+        and capped so every worker gets a share
+    :return: DataFrame with one row per combination, best Profit/Loss first
+    :raises ValueError: if a window or lookback in param_grid is below 1
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    for name in WINDOW_PARAMS[strategy]:
+        if any(value < 1 for value in param_grid[name]):
+            raise ValueError(f"{name} values must be at least 1 bar")
+    keys = list(param_grid)
+    combos = [dict(zip(keys, values)) for values in product(*param_grid.values())]
+    if strategy == "sma_crossover":
+        combos = [c for c in combos if c["short_window"] < c["long_window"]]
+    if len(prices) < 2 or not combos:
+        return pd.DataFrame()
+
+    workers = max_workers or os.cpu_count()
+    chunk_size = chunk_size or min(sweep_chunk_size(len(prices)), -(-len(combos) // workers))
+    chunks = [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+    rows = []
+    if max_workers == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            rows.extend(_run_sweep_chunk(prices, strategy, chunk, initial_balance, fee))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_sweep_chunk, prices, strategy, chunk, initial_balance, fee) for chunk in chunks]
+            for future in futures:
+                rows.extend(future.result())
+
+    return pd.DataFrame(rows).sort_values("Profit/Loss", ascending=False, ignore_index=True)
+
+def load_price_history(coin, days=365, resolution="hourly"):
+    """Load stored price history (filling gaps from CoinGecko) as a NumPy array for sweeps."""
+    end_timestamp = int(time.time())
+    df = price_store.get_prices(coin, end_timestamp - days * 24 * 60 * 60, end_timestamp, resolution)
+    if df.empty:
+        return np.array([])
+    return df["price"].to_numpy(dtype=np.float64)
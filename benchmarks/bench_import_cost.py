@@ -0,0 +1,99 @@
+"""Measure the cold import time of each module and check that importing it does no network or database work.
+
+Every module is imported in a fresh interpreter with socket connects, DNS lookups and
+sqlite3.connect intercepted; any such call during the import is reported as a side effect.
+Streamlit page scripts render on import and are left out unless named explicitly.
+
+Usage: python benchmarks/bench_import_cost.py [--repeat N] [module ...]
+"""
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE_SCRIPTS = {"app", "debug", "tracking_dashboard", "trading_dashboard", "wallet_monitoring"}
+
+HEAVY_PACKAGES = {"ccxt", "discord", "joblib", "plotly", "scipy", "sklearn", "streamlit", "telebot", "websocket"}
+
+PROBE = r'''
+import json, socket, sqlite3, sys, time
+
+side_effects = []
+
+def _connect(sock, address, *args):
+    side_effects.append(f"socket.connect: {address}")
+    raise OSError("network access during import")
+
+def _getaddrinfo(host, *args, **kwargs):
+    side_effects.append(f"DNS lookup: {host}")
+    raise OSError("network access during import")
+
+def _sqlite_connect(database, *args, **kwargs):
+    side_effects.append(f"sqlite3.connect: {database}")
+    return _real_sqlite_connect(":memory:")
+
+_real_sqlite_connect = sqlite3.connect
+socket.socket.connect = _connect
+socket.getaddrinfo = _getaddrinfo
+sqlite3.connect = _sqlite_connect
+
+before = set(sys.modules)
+error = None
+start = time.perf_counter()
+try:
+    __import__(sys.argv[1])
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - start
+loaded = {name.split(".")[0] for name in set(sys.modules) - before}
+print(json.dumps({"seconds": elapsed, "loaded": sorted(loaded), "side_effects": side_effects, "error": error}))
+'''
+
+
+def measure(module, repeat):
+    """Best-of-repeat cold import of one module, with what it pulled in and any side effects."""
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", PROBE, module], cwd=ROOT, capture_output=True, text=True)
+        lines = completed.stdout.strip().splitlines()
+        try:
+            result = json.loads(lines[-1])
+        except (IndexError, ValueError):
+            result = {"seconds": float("nan"), "loaded": [], "side_effects": [],
+                      "error": (completed.stderr.strip().splitlines() or ["no output"])[-1]}
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = 3
+    if args[:1] == ["--repeat"]:
+        repeat, args = int(args[1]), args[2:]
+    modules = args or sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(ROOT, "*.py"))
+                             if os.path.splitext(os.path.basename(path))[0] not in PAGE_SCRIPTS)
+
+    failures = 0
+    print(f"{'module':32} {'import':>9}  heavy dependencies")
+    for module in modules:
+        result = measure(module, repeat)
+        heavy = ", ".join(sorted(HEAVY_PACKAGES.intersection(result["loaded"]))) or "-"
+        print(f"{module:32} {result['seconds'] * 1000:7.0f}ms  {heavy}")
+        for effect in result["side_effects"]:
+            print(f"    🚨 {effect}")
+        if result["error"]:
+            print(f"    ⚠️ import failed: {result['error']}")
+        failures += bool(result["side_effects"])
+
+    if failures:
+        print(f"🚨 {failures} module(s) do network or database work at import")
+        sys.exit(1)
+    print("✅ No module does network or database work at import")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import atexit
+import base64
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chain_sketches (
+    chain TEXT NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (chain, bucket_start)
+) WITHOUT ROWID;
+"""
+
+_local = threading.local()
+
+
+def _get_connection():
+    """Return this thread's connection to the sketch store, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(config.SKETCH_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _hash64(item):
+    return int.from_bytes(hashlib.blake2b(str(item).encode(), digest_size=8).digest(), "big")
+
+
+def _pack(array):
+    return base64.b64encode(zlib.compress(array.tobytes())).decode()
+
+
+def _unpack(text, dtype):
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=dtype).copy()
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2**precision one-byte registers (about 1.04 / sqrt(2**precision) error)."""
+
+    def __init__(self, precision=12, registers=None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.m, dtype=np.uint8)
+
+    def add_many(self, items):
+        suffix_bits = 64 - self.precision
+        indices, ranks = [], []
+        for item in items:
+            h = _hash64(item)
+            indices.append(h >> suffix_bits)
+            ranks.append(suffix_bits - (h & ((1 << suffix_bits) - 1)).bit_length() + 1)  # Leading zeros + 1
+        np.maximum.at(self.registers, np.array(indices, dtype=np.int64), np.array(ranks, dtype=np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)  # Linear counting for small cardinalities
+        return int(round(estimate))
+
+    def to_dict(self):
+        return {"precision": self.precision, "registers": _pack(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["precision"], _unpack(data["registers"], np.uint8))
+
+
+class CountMinSketch:
+    """Weighted frequency estimates that never undercount; error is at most total_weight * e / width."""
+
+    def __init__(self, width=1024, depth=4, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.float64)
+
+    def _indices(self, items):
+        """(len(items), depth) column index of every item in every row, by double hashing."""
+        hashes = np.array([_hash64(item) for item in items], dtype=np.uint64).reshape(-1, 1)
+        h1, h2 = hashes & np.uint64(0xFFFFFFFF), hashes >> np.uint64(32)
+        return ((h1 + np.arange(self.depth, dtype=np.uint64) * h2) % np.uint64(self.width)).astype(np.int64)
+
+    def add_many(self, items, weights):
+        """Add weights to items and return the new estimate of each."""
+        indices = self._indices(items)
+        rows = np.arange(self.depth)
+        np.add.at(self.table, (rows, indices), np.asarray(weights, dtype=np.float64).reshape(-1, 1))
+        return self.table[rows, indices].min(axis=1)
+
+    def estimate_many(self, items):
+        return self.table[np.arange(self.depth), self._indices(items)].min(axis=1)
+
+    def merge(self, other):
+        self.table += other.table
+        return self
+
+    def to_dict(self):
+        return {"width": self.width, "depth": self.depth, "table": _pack(self.table)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["width"], data["depth"], _unpack(data["table"], np.float64).reshape(data["depth"], data["width"]))
+
+
+class HeavyHitters:
+    """Count-Min sketch plus the k items with the largest estimates seen so far."""
+
+    def __init__(self, k=None, sketch=None, candidates=None):
+        self.k = k or config.SKETCH_TOP_K
+        self.sketch = sketch or CountMinSketch(config.SKETCH_CMS_WIDTH, config.SKETCH_CMS_DEPTH)
+        self.candidates = candidates or {}
+
+    def add_many(self, items, weights):
+        if items:
+            self._offer(dict(zip(items, self.sketch.add_many(items, weights).tolist())))
+
+    def _offer(self, estimates):
+        """Keep the k largest of the current candidates and the given {item: estimate}."""
+        self.candidates.update(estimates)
+        if len(self.candidates) > self.k:
+            self.candidates = dict(sorted(self.candidates.items(), key=lambda entry: entry[1], reverse=True)[:self.k])
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        items = list(set(self.candidates) | set(other.candidates))
+        self.candidates = {}
+        if items:
+            self._offer(dict(zip(items, self.sketch.estimate_many(items).tolist())))
+        return self
+
+    def top(self, n=None):
+        return sorted(self.candidates.items(), key=lambda entry: entry[1], reverse=True)[:n or self.k]
+
+    def to_dict(self):
+        return {"k": self.k, "sketch": self.sketch.to_dict(), "candidates": self.candidates}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["k"], CountMinSketch.from_dict(data["sketch"]), dict(data["candidates"]))
+
+
+class ChainSketch:
+    """Bounded-memory summary of one chain's transactions in one time bucket."""
+
+    def __init__(self, transactions=0, volume=0.0, addresses=None, top_addresses=None, top_tokens=None):
+        self.transactions = transactions
+        self.volume = volume
+        self.addresses = addresses or HyperLogLog(config.SKETCH_HLL_PRECISION)
+        self.top_addresses = top_addresses or HeavyHitters()  # Weighted by native value moved
+        self.top_tokens = top_tokens or HeavyHitters()  # Weighted by transfer count
+
+    def add_many(self, transactions):
+        addresses, senders, sent, tokens = [], [], [], []
+        for tx in transactions:
+            self.transactions += 1
+            for address in (tx.from_address, tx.to_address):
+                if address:
+                    addresses.append(address)
+            if tx.token is None:
+                value = abs(tx.value)
+                self.volume += value
+                if tx.from_address and value:
+                    senders.append(tx.from_address)
+                    sent.append(value)
+            tokens.append(tx.token or "native")
+        self.addresses.add_many(addresses)
+        self.top_addresses.add_many(senders, sent)
+        self.top_tokens.add_many(tokens, [1.0] * len(tokens))
+
+    def merge(self, other):
+        self.transactions += other.transactions
+        self.volume += other.volume
+        self.addresses.merge(other.addresses)
+        self.top_addresses.merge(other.top_addresses)
+        self.top_tokens.merge(other.top_tokens)
+        return self
+
+    def to_json(self):
+        return json.dumps({
+            "transactions": self.transactions,
+            "volume": self.volume,
+            "addresses": self.addresses.to_dict(),
+            "top_addresses": self.top_addresses.to_dict(),
+            "top_tokens": self.top_tokens.to_dict(),
+        })
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        return cls(data["transactions"], data["volume"], HyperLogLog.from_dict(data["addresses"]),
+                   HeavyHitters.from_dict(data["top_addresses"]), HeavyHitters.from_dict(data["top_tokens"]))
+
+
+_pending = {}  # (chain, bucket_start) -> ChainSketch not yet merged into the store
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def record_transactions(transactions):
+    """Add Transaction records to the in-memory sketches of their chain and time bucket."""
+    bucket_seconds = config.SKETCH_BUCKET_SECONDS
+    now = time.time()
+    batches = {}
+    for tx in transactions:
+        timestamp = tx.timestamp or now
+        batches.setdefault((tx.chain, int(timestamp // bucket_seconds * bucket_seconds)), []).append(tx)
+    with _pending_lock:
+        for key, batch in batches.items():
+            sketch = _pending.get(key)
+            if sketch is None:
+                sketch = _pending[key] = ChainSketch()
+            sketch.add_many(batch)
+        due = time.monotonic() - _last_flush >= config.SKETCH_FLUSH_INTERVAL
+    if due:
+        flush()
+
+
+def flush():
+    """Merge pending sketches into the store, so other processes see them, and drop expired buckets."""
+    global _pending, _last_flush
+    with _pending_lock:
+        pending, _pending = _pending, {}
+        _last_flush = time.monotonic()
+    if not pending:
+        return  # Nothing to merge, so no write lock; retention waits for the next flush with data
+    conn = _get_connection()
+    # Take the write lock before reading, so a flush from another process cannot merge into the
+    # same bucket between our SELECT and INSERT and have its counts overwritten
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for (chain, bucket_start), sketch in pending.items():
+            row = conn.execute("SELECT state FROM chain_sketches WHERE chain = ? AND bucket_start = ?", (chain, bucket_start)).fetchone()
+            if row:
+                sketch = ChainSketch.from_json(row[0]).merge(sketch)
+            conn.execute("INSERT OR REPLACE INTO chain_sketches (chain, bucket_start, state) VALUES (?, ?, ?)",
+                         (chain, bucket_start, sketch.to_json()))
+        conn.execute("DELETE FROM chain_sketches WHERE bucket_start < ?", (time.time() - config.SKETCH_RETENTION,))
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+atexit.register(flush)  # No-op in processes that never recorded anything
+
+
+def get_chain_sketch(chain, window=24 * 3600):
+    """Merge the stored buckets of the last `window` seconds into one ChainSketch."""
+    if _pending:  # Include this process's unflushed counts; readers otherwise never take the write lock
+        flush()
+    merged = ChainSketch()
+    rows = _get_connection().execute(
+        "SELECT state FROM chain_sketches WHERE chain = ? AND bucket_start >= ?",
+        (chain, int(time.time() - window) // config.SKETCH_BUCKET_SECONDS * config.SKETCH_BUCKET_SECONDS),
+    )
+    for state, in rows:
+        merged.merge(ChainSketch.from_json(state))
+    return merged
+
+
+def get_chain_summary(chain, window=24 * 3600, top_n=10):
+    """Transaction count, native volume, distinct active addresses and heavy hitters for a chain."""
+    sketch = get_chain_sketch(chain, window)
+    return {
+        "total_transactions": sketch.transactions,
+        "total_volume": sketch.volume,
+        "active_wallets": sketch.addresses.count(),
+        "top_addresses": sketch.top_addresses.top(top_n),
+        "top_tokens": sketch.top_tokens.top(top_n),
+    }
@@ -0,0 +1,130 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Shared HTTP client (http_client.py)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))  # Number of hosts to keep pools for
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))  # Keep-alive connections per host
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))  # Seconds
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 20))  # Seconds
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+HTTP_RETRY_STATUSES = (500, 502, 503, 504)
+
+# Batched balance lookups (wallet_tracker.get_wallet_balances)
+BALANCE_MAX_WORKERS = int(os.getenv("BALANCE_MAX_WORKERS", 8))  # Concurrent batch requests per call
+
+# Per-provider token buckets (rate_limiter.py): host -> (requests per second, burst capacity)
+RATE_LIMITS = {
+    "api.coingecko.com": (0.5, 5),
+    "api.etherscan.io": (5, 5),
+    "api.bscscan.com": (5, 5),
+    "api.solscan.io": (2, 5),
+    "api.solana.fm": (2, 5),
+    "api.mainnet-beta.solana.com": (10, 20),
+    "blockchain.info": (1, 5),
+    "api.blockchain.info": (1, 5),
+    "api.binance.com": (20, 40),
+}
+RATE_LIMIT_DEFAULT = (5, 10)
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", 5))  # Longest a caller queues before the request is dropped
+RATE_LIMIT_INTERACTIVE_MAX_WAIT = float(os.getenv("RATE_LIMIT_INTERACTIVE_MAX_WAIT", 0))  # Same, for dashboard render threads
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", 2))  # Retries after a 429 response
+RATE_LIMIT_BACKOFF_BASE = 1.0  # Seconds
+RATE_LIMIT_BACKOFF_CAP = 60.0  # Seconds
+
+# Local price time-series store (price_store.py)
+PRICE_STORE_PATH = os.getenv("PRICE_STORE_PATH", "price_history.db")
+PRICE_STORE_MAX_STALENESS = int(os.getenv("PRICE_STORE_MAX_STALENESS", 900))  # Seconds before the latest prices are refetched
+
+# Persisted AI trading models (model_registry.py)
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "models")
+MODEL_RETRAIN_INTERVAL = int(os.getenv("MODEL_RETRAIN_INTERVAL", 24 * 3600))  # Seconds between scheduled retrains
+MODEL_RETRAIN_NEW_DATA = int(os.getenv("MODEL_RETRAIN_NEW_DATA", 24 * 3600))  # Seconds of new data past the watermark that trigger a retrain
+
+# Tick ingestion (tick_ingestion.py)
+TICK_BUFFER_CAPACITY = int(os.getenv("TICK_BUFFER_CAPACITY", 1 << 20))  # Ticks held before the oldest are dropped
+TICK_BATCH_SIZE = int(os.getenv("TICK_BATCH_SIZE", 10000))  # Maximum ticks per consumer hand-off
+TICK_FLUSH_INTERVAL = float(os.getenv("TICK_FLUSH_INTERVAL", 0.05))  # Seconds between hand-offs
+
+# Notification dispatcher (notifications.py)
+NOTIFY_WORKERS = {"email": 1, "telegram": 2, "discord": 2}  # Concurrent deliveries per channel
+NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE", 1000))  # Alerts per channel before new ones are dropped
+NOTIFY_MAX_RETRIES = int(os.getenv("NOTIFY_MAX_RETRIES", 3))
+NOTIFY_RETRY_BACKOFF = float(os.getenv("NOTIFY_RETRY_BACKOFF", 2))  # Seconds, doubled per retry
+NOTIFY_FLUSH_TIMEOUT = float(os.getenv("NOTIFY_FLUSH_TIMEOUT", 30))  # Seconds to drain queues at exit
+NOTIFY_SMTP_TIMEOUT = float(os.getenv("NOTIFY_SMTP_TIMEOUT", 30))  # Seconds per SMTP connect/login/send
+
+# Wallet monitor state (monitor_store.py)
+MONITOR_STORE_PATH = os.getenv("MONITOR_STORE_PATH", "wallet_monitor.db")
+
+# Wallet tracking database (database.py)
+WALLET_DB_PATH = os.getenv("WALLET_DB_PATH", "wallet_tracking.db")
+ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", 90))  # Older wallet_activity rows move to the archive table
+INGEST_DEDUP_RETENTION = int(os.getenv("INGEST_DEDUP_RETENTION", 7 * 24 * 3600))  # Seconds ingested tx hashes are kept for dedup
+DUST_TRANSACTION_VALUE = float(os.getenv("DUST_TRANSACTION_VALUE", 0.01))  # Receipts below this are left out when skipping demo wallets
+
+# Raw transaction store (transaction_store.py)
+TX_STORE_PATH = os.getenv("TX_STORE_PATH", "transactions.db")
+
+# Paginated wallet history (transaction_history.py)
+HISTORY_MAX_CONCURRENCY = int(os.getenv("HISTORY_MAX_CONCURRENCY", 4))  # Pages in flight per wallet crawl
+HISTORY_EVM_PAGE_SIZE = int(os.getenv("HISTORY_EVM_PAGE_SIZE", 1000))  # Etherscan offset per page
+HISTORY_BITCOIN_PAGE_SIZE = int(os.getenv("HISTORY_BITCOIN_PAGE_SIZE", 50))  # blockchain.info rawaddr maximum
+
+# Streaming spender leaderboard (spender_leaderboard.py)
+LEADERBOARD_WINDOWS = {"1h": 3600, "24h": 24 * 3600, "7d": 7 * 24 * 3600}  # Window name -> seconds
+LEADERBOARD_BUCKET_SECONDS = int(os.getenv("LEADERBOARD_BUCKET_SECONDS", 60))  # Time granularity of window eviction
+
+# Seen-transaction filter for snapshot pollers (seen_filter.py)
+SEEN_TX_MAX_SIZE = int(os.getenv("SEEN_TX_MAX_SIZE", 100000))  # Hashes remembered per poller
+SEEN_TX_TTL = int(os.getenv("SEEN_TX_TTL", 6 * 3600))  # Seconds a hash is remembered after its last sighting
+
+# Real-time chain analytics sketches (chain_sketches.py)
+SKETCH_STORE_PATH = os.getenv("SKETCH_STORE_PATH", "chain_sketches.db")
+SKETCH_BUCKET_SECONDS = int(os.getenv("SKETCH_BUCKET_SECONDS", 3600))  # One mergeable sketch per chain and bucket
+SKETCH_RETENTION = int(os.getenv("SKETCH_RETENTION", 7 * 24 * 3600))  # Seconds of buckets kept
+SKETCH_FLUSH_INTERVAL = float(os.getenv("SKETCH_FLUSH_INTERVAL", 30))  # Seconds between merges into the store
+SKETCH_HLL_PRECISION = int(os.getenv("SKETCH_HLL_PRECISION", 12))  # 4096 registers, ~1.6% error
+SKETCH_CMS_WIDTH = int(os.getenv("SKETCH_CMS_WIDTH", 1024))
+SKETCH_CMS_DEPTH = int(os.getenv("SKETCH_CMS_DEPTH", 4))
+SKETCH_TOP_K = int(os.getenv("SKETCH_TOP_K", 20))  # Heavy hitters tracked per sketch
+
+# Dashboard data cache (data_cache.py): cache name -> seconds before a result is refetched
+CACHE_TTLS = {
+    "crypto_prices": int(os.getenv("CACHE_TTL_CRYPTO_PRICES", 60)),
+    "real_time_data": int(os.getenv("CACHE_TTL_REAL_TIME_DATA", 60)),
+    "historical_prices": int(os.getenv("CACHE_TTL_HISTORICAL_PRICES", 300)),
+    "recent_prices": int(os.getenv("CACHE_TTL_RECENT_PRICES", 120)),
+    "wallet_scan": int(os.getenv("CACHE_TTL_WALLET_SCAN", 120)),
+    "wallet_charts": int(os.getenv("CACHE_TTL_WALLET_CHARTS", 60)),
+    "wallet_counts": int(os.getenv("CACHE_TTL_WALLET_COUNTS", 60)),
+}
+CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 60))
+CACHE_EMPTY_TTL = int(os.getenv("CACHE_EMPTY_TTL", 15))  # Seconds an empty (failed) result is kept, so outages still back off
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 128))  # Per cache; least recently used results are evicted first
+CACHE_REFRESH_AHEAD = float(os.getenv("CACHE_REFRESH_AHEAD", 0.8))  # Fraction of the TTL after which a hit refreshes in the background
+
+# Parameter sweeps (backtesting_module.run_parameter_sweep)
+SWEEP_CHUNK_MEMORY_MB = int(os.getenv("SWEEP_CHUNK_MEMORY_MB", 256))  # Working memory per sweep worker; sizes each chunk
+
+# Precompute daemon (precompute_daemon.py) and the snapshots it publishes (snapshot_store.py)
+SNAPSHOT_STORE_PATH = os.getenv("SNAPSHOT_STORE_PATH", "snapshots.db")
+SNAPSHOT_KEEP_VERSIONS = int(os.getenv("SNAPSHOT_KEEP_VERSIONS", 5))  # Versions kept per snapshot
+SNAPSHOT_MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", 900))  # Seconds before the dashboard stops trusting a snapshot and fetches inline
+PRECOMPUTE_INTERVALS = {  # Job -> seconds between refreshes
+    "crypto_prices": int(os.getenv("PRECOMPUTE_CRYPTO_PRICES_INTERVAL", 60)),
+    "real_time_data": int(os.getenv("PRECOMPUTE_REAL_TIME_DATA_INTERVAL", 60)),
+    "recent_prices": int(os.getenv("PRECOMPUTE_RECENT_PRICES_INTERVAL", 300)),
+    "tracked_wallets": int(os.getenv("PRECOMPUTE_TRACKED_WALLETS_INTERVAL", 120)),
+    "leaderboard": int(os.getenv("PRECOMPUTE_LEADERBOARD_INTERVAL", 60)),
+    "risk_metrics": int(os.getenv("PRECOMPUTE_RISK_METRICS_INTERVAL", 3600)),
+}
+PRECOMPUTE_LEADERBOARD_SIZE = int(os.getenv("PRECOMPUTE_LEADERBOARD_SIZE", 100))  # Spenders per leaderboard snapshot
+
+# Wallet Tracking tables and charts (database.query_wallets, database.wallet_histogram)
+WALLET_PAGE_SIZE = int(os.getenv("WALLET_PAGE_SIZE", 50))  # Rows per table page sent to the browser
+WALLET_TRACKING_MAX_WALLETS = int(os.getenv("WALLET_TRACKING_MAX_WALLETS", 100000))  # Upper end of the dashboard's wallet slider
+WALLET_CHART_TOP_N = int(os.getenv("WALLET_CHART_TOP_N", 25))  # Bars in the top-wallets chart
+WALLET_HISTOGRAM_EDGES = (0.01, 0.1, 1, 10, 100, 1000)  # Total-received bucket boundaries
@@ -0,0 +1,163 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+import config
+
+
+def _is_empty(value):
+    if value is None:
+        return True
+    if isinstance(value, pd.DataFrame):
+        return value.empty
+    return isinstance(value, (dict, list, tuple)) and not value
+
+
+def _make_key(args, kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = repr(key)
+    return key
+
+
+class TTLCache:
+    """Size-bounded LRU of function results that expire after ttl seconds.
+
+    A hit on an entry older than refresh_ahead * ttl still returns it but starts a
+    background refresh, so data that is read often rarely blocks on a fetch.
+    Concurrent misses on one key share a single call. Empty results (failed or
+    rate-limited fetches) are only kept for config.CACHE_EMPTY_TTL seconds.
+    """
+
+    def __init__(self, ttl=None, max_entries=None, refresh_ahead=None):
+        self.ttl = ttl or config.CACHE_DEFAULT_TTL
+        self.max_entries = max_entries or config.CACHE_MAX_ENTRIES
+        self.refresh_ahead = config.CACHE_REFRESH_AHEAD if refresh_ahead is None else refresh_ahead
+        self._entries = OrderedDict()  # key -> (value, fetched_at, expires_at), least recently used first
+        self._inflight = {}  # key -> Event set when the running fetch finishes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    def get(self, key, loader):
+        """Return the cached result for key, calling loader() on a miss or expiry."""
+        while True:
+            now = time.time()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and now < entry[2]:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    if now - entry[1] >= self.ttl * self.refresh_ahead and key not in self._inflight:
+                        self._inflight[key] = threading.Event()
+                        self.refreshes += 1
+                        threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+                    return entry[0]
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self.misses += 1
+                    self._inflight[key] = threading.Event()
+                    break
+            pending.wait()  # Another caller is fetching this key; use its result
+        return self._load(key, loader)
+
+    def _load(self, key, loader):
+        try:
+            value = loader()
+            now = time.time()
+            with self._lock:
+                self._entries[key] = (value, now, now + (config.CACHE_EMPTY_TTL if _is_empty(value) else self.ttl))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def _refresh(self, key, loader):
+        try:
+            self._load(key, loader)
+        except Exception as e:
+            print(f"⚠️ Background refresh failed, keeping the cached value: {e}")
+
+    def fetched_at(self, key):
+        """Unix time the cached result for key was fetched, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry else None
+
+    def invalidate(self, key=None):
+        """Drop one key, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+_caches = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name):
+    """Shared TTLCache for one data function, with its TTL from config.CACHE_TTLS."""
+    with _registry_lock:
+        if name not in _caches:
+            _caches[name] = TTLCache(config.CACHE_TTLS.get(name))
+        return _caches[name]
+
+
+def cached(name):
+    """Decorate a data function with the shared cache called name.
+
+    The cache lives in this module rather than on the wrapper, so Streamlit
+    reruns that re-decorate the function keep hitting the same entries.
+    The wrapper gains invalidate(*args, **kwargs) and fetched_at(*args, **kwargs).
+    """
+    def decorator(func):
+        cache = get_cache(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache.get(_make_key(args, kwargs), lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.invalidate = lambda *args, **kwargs: cache.invalidate(_make_key(args, kwargs))
+        wrapper.fetched_at = lambda *args, **kwargs: cache.fetched_at(_make_key(args, kwargs))
+        return wrapper
+    return decorator
+
+
+def invalidate_all():
+    """Empty every cache, e.g. from the dashboard's refresh button."""
+    with _registry_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidate()
+
+
+def get_cache_stats():
+    with _registry_lock:
+        caches = dict(_caches)
+    return {name: cache.get_stats() for name, cache in caches.items()}
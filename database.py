@@ -1,10 +1,58 @@
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 
-def create_wallet_activity_table():
-    """Creates a database table to store wallet activity."""
-    conn = sqlite3.connect("wallet_tracking.db")
-    cursor = conn.cursor()
-    cursor.execute("""
+import numpy as np
+import pandas as pd
+
+import config
+from wallet_aggregation import REPEATED_BUYER_MIN_TRANSACTIONS, aggregate_by_address
+
+_conn = None
+_conn_pid = None
+_lock = threading.RLock()
+
+
+WALLETS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS wallets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        wallet_address TEXT NOT NULL,
+        blockchain TEXT NOT NULL,
+        total_received REAL,
+        transaction_count INTEGER,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (wallet_address, blockchain)
+    )
+"""
+
+
+def _has_unique_index(conn, table, columns):
+    for index in conn.execute(f"PRAGMA index_list({table})"):
+        if index[2] and [col[2] for col in conn.execute(f"PRAGMA index_info('{index[1]}')")] == columns:
+            return True
+    return False
+
+
+def _migration_1_canonical_schema(conn):
+    """Single schema for every table; wallets becomes unique per (wallet_address, blockchain)."""
+    conn.execute(WALLETS_TABLE_SQL)
+    if not _has_unique_index(conn, "wallets", ["wallet_address", "blockchain"]):
+        # Older app.py/wallet_tracker.py tables: keep the latest row per wallet and chain
+        conn.execute("ALTER TABLE wallets RENAME TO wallets_legacy")
+        conn.execute(WALLETS_TABLE_SQL)
+        conn.execute("""
+            INSERT INTO wallets (wallet_address, blockchain, total_received, transaction_count, last_updated)
+            SELECT wallet_address, COALESCE(blockchain, ''), total_received, transaction_count, last_updated
+            FROM wallets_legacy
+            WHERE wallet_address IS NOT NULL
+              AND id IN (SELECT MAX(id) FROM wallets_legacy GROUP BY wallet_address, COALESCE(blockchain, ''))
+        """)
+        conn.execute("DROP TABLE wallets_legacy")
+
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS wallet_activity (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             wallet_address TEXT,
@@ -18,33 +66,459 @@ def create_wallet_activity_table():
             date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
-    conn.commit()
-    conn.close()
+    for table in ("new_wallets", "repeated_buyers"):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                wallet_address TEXT,
+                blockchain TEXT,
+                total_received REAL,
+                transaction_count INTEGER,
+                date TEXT
+            )
+        """)
+
+
+def _migration_2_query_indexes(conn):
+    """Composite indexes for per-chain dashboard queries and per-wallet lookups."""
+    # wallets (wallet_address, blockchain) is already covered by its UNIQUE constraint
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallets_chain_updated ON wallets (blockchain, last_updated)")
+    for table in ("wallet_activity", "new_wallets", "repeated_buyers"):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_chain_date ON {table} (blockchain, date)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_wallet_chain ON {table} (wallet_address, blockchain)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallet_activity_date ON wallet_activity (date)")  # Retention sweeps
+
+
+def _migration_3_activity_archive(conn):
+    """Rolling retention: wallet_activity keeps recent rows, older ones move to wallet_activity_archive."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS wallet_activity_archive (
+            id INTEGER PRIMARY KEY,
+            wallet_address TEXT,
+            blockchain TEXT,
+            first_funds_received REAL,
+            first_token TEXT,
+            first_token_amount REAL,
+            remaining_balance REAL,
+            spending_pattern TEXT,
+            highest_spend REAL,
+            date TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallet_activity_archive_chain_date ON wallet_activity_archive (blockchain, date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallet_activity_archive_wallet_chain ON wallet_activity_archive (wallet_address, blockchain)")
+
+
+def _migration_4_ingestion_cursors(conn):
+    """Per-chain ingestion cursors and the tx hashes already counted into wallet totals."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_cursors (
+            blockchain TEXT PRIMARY KEY,
+            last_tx_hash TEXT,
+            last_block INTEGER,
+            last_timestamp INTEGER,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingested_transactions (
+            blockchain TEXT NOT NULL,
+            tx_hash TEXT NOT NULL,
+            ingested_at REAL NOT NULL,
+            PRIMARY KEY (blockchain, tx_hash)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ingested_transactions_at ON ingested_transactions (ingested_at)")
+
+
+def _migration_5_wallet_sort_indexes(conn):
+    """Per-chain indexes for paging through wallets by total received or transaction count."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallets_chain_received ON wallets (blockchain, total_received)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallets_chain_count ON wallets (blockchain, transaction_count)")
+
+
+def _migration_6_dust_free_totals(conn):
+    """Wallet totals without dust receipts, for the dashboard's "Skip Demo Wallets" filter.
+
+    Existing totals cannot be split, so they count as dust-free unless the whole total is below the dust value.
+    """
+    conn.execute("ALTER TABLE wallets ADD COLUMN dust_free_received REAL")
+    conn.execute("ALTER TABLE wallets ADD COLUMN dust_free_count INTEGER")
+    conn.execute("""
+        UPDATE wallets SET
+            dust_free_received = CASE WHEN total_received >= ? THEN total_received ELSE 0 END,
+            dust_free_count = CASE WHEN total_received >= ? THEN transaction_count ELSE 0 END
+    """, (config.DUST_TRANSACTION_VALUE, config.DUST_TRANSACTION_VALUE))
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS wallets_dust_free AS
+        SELECT id, wallet_address, blockchain, dust_free_received AS total_received,
+               dust_free_count AS transaction_count, last_updated
+        FROM wallets WHERE +dust_free_count > 0  -- Unary + keeps this filter off the indexes, so sorts still use them
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallets_chain_dust_free_received ON wallets (blockchain, dust_free_received)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wallets_chain_dust_free_count ON wallets (blockchain, dust_free_count)")
+
+
+# Applied in order; PRAGMA user_version records how many have run
+MIGRATIONS = [
+    _migration_1_canonical_schema,
+    _migration_2_query_indexes,
+    _migration_3_activity_archive,
+    _migration_4_ingestion_cursors,
+    _migration_5_wallet_sort_indexes,
+    _migration_6_dust_free_totals,
+]
+
+UPSERT_WALLET_SQL = """
+    INSERT INTO wallets (wallet_address, blockchain, total_received, transaction_count,
+                         dust_free_received, dust_free_count, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (wallet_address, blockchain) DO UPDATE SET
+        total_received = excluded.total_received,
+        transaction_count = excluded.transaction_count,
+        dust_free_received = excluded.dust_free_received,
+        dust_free_count = excluded.dust_free_count,
+        last_updated = excluded.last_updated
+"""
+
+INCREMENT_WALLET_SQL = """
+    INSERT INTO wallets (wallet_address, blockchain, total_received, transaction_count,
+                         dust_free_received, dust_free_count, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (wallet_address, blockchain) DO UPDATE SET
+        total_received = COALESCE(total_received, 0) + excluded.total_received,
+        transaction_count = COALESCE(transaction_count, 0) + excluded.transaction_count,
+        dust_free_received = COALESCE(dust_free_received, 0) + excluded.dust_free_received,
+        dust_free_count = COALESCE(dust_free_count, 0) + excluded.dust_free_count,
+        last_updated = excluded.last_updated
+"""
+
+UPSERT_CURSOR_SQL = """
+    INSERT INTO ingestion_cursors (blockchain, last_tx_hash, last_block, last_timestamp, updated_at)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT (blockchain) DO UPDATE SET
+        last_tx_hash = excluded.last_tx_hash,
+        last_block = excluded.last_block,
+        last_timestamp = excluded.last_timestamp,
+        updated_at = excluded.updated_at
+"""
+
+SQL_VARIABLE_CHUNK = 900  # Stay under SQLite's bound-parameter limit in IN (...) lists
+
+TRACKERS_SQL = "SELECT * FROM wallet_activity WHERE blockchain = ? ORDER BY date DESC"
+
+TRACKERS_WITH_ARCHIVE_SQL = """
+    SELECT * FROM (
+        SELECT * FROM wallet_activity WHERE blockchain = ?
+        UNION ALL
+        SELECT * FROM wallet_activity_archive WHERE blockchain = ?
+    ) ORDER BY date DESC
+"""
+
+RECENT_WALLETS_SQL = "SELECT * FROM wallets WHERE blockchain = ? ORDER BY last_updated DESC LIMIT ?"
+RECENT_DUST_FREE_WALLETS_SQL = "SELECT * FROM wallets_dust_free WHERE blockchain = ? ORDER BY last_updated DESC LIMIT ?"
+RECENT_CUTOFF_SQL = "SELECT last_updated FROM {table} WHERE blockchain = ? ORDER BY last_updated DESC LIMIT 1 OFFSET ?"
+
+WALLET_PAGE_COLUMNS = ["wallet_address", "total_received", "transaction_count", "last_updated"]
+WALLET_SORT_COLUMNS = ("total_received", "transaction_count", "last_updated", "wallet_address")
+
+INSERT_ACTIVITY_SQL = """
+    INSERT INTO wallet_activity (wallet_address, blockchain, first_funds_received, first_token, first_token_amount, remaining_balance, spending_pattern, highest_spend)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _apply_migrations(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        with transaction() as txn:
+            migration(txn)
+            txn.execute(f"PRAGMA user_version = {number}")
+
+
+def get_connection():
+    """Return the process-wide connection to wallet_tracking.db, migrating the schema on first use.
+
+    The connection is shared across threads; use transaction() or query(), which serialize access.
+    """
+    global _conn, _conn_pid
+    if _conn is None or _conn_pid != os.getpid():
+        with _lock:
+            if _conn is None or _conn_pid != os.getpid():
+                conn = sqlite3.connect(config.WALLET_DB_PATH, isolation_level=None, check_same_thread=False,
+                                       timeout=30, cached_statements=256)
+                conn.execute("PRAGMA journal_mode=WAL")  # Dashboard readers never block on monitor writes
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA cache_size=-64000")  # 64 MB
+                conn.execute("PRAGMA foreign_keys=ON")
+                _conn, _conn_pid = conn, os.getpid()
+                _apply_migrations(conn)
+    return _conn
+
+
+@contextmanager
+def transaction():
+    """Run a block of statements as one atomic transaction on the shared connection."""
+    conn = get_connection()
+    with _lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def query(sql, params=()):
+    """Run a read query on the shared connection and return all rows."""
+    conn = get_connection()
+    with _lock:
+        return conn.execute(sql, params).fetchall()
+
+
+def initialize_database():
+    """Create or migrate every table in wallet_tracking.db."""
+    get_connection()
+
+
+def create_wallet_activity_table():
+    """Creates a database table to store wallet activity."""
+    initialize_database()
+
+
+def upsert_wallets(wallets):
+    """Bulk insert or update wallet totals in a single transaction.
+
+    Dust-free totals default to the full totals when a wallet dict has no dust_free_received/dust_free_count.
+    """
+    now = str(datetime.now())
+    rows = [(w["wallet_address"], w["blockchain"], w["total_received"], w["transaction_count"],
+             w.get("dust_free_received", w["total_received"]), w.get("dust_free_count", w["transaction_count"]), now)
+            for w in wallets]
+    with transaction() as conn:
+        conn.executemany(UPSERT_WALLET_SQL, rows)
+    return len(rows)
+
+
+def get_ingestion_cursor(blockchain):
+    """Return {"last_tx_hash", "last_block", "last_timestamp"} for a chain, or None before its first ingest."""
+    rows = query("SELECT last_tx_hash, last_block, last_timestamp FROM ingestion_cursors WHERE blockchain = ?", (blockchain,))
+    if not rows:
+        return None
+    last_tx_hash, last_block, last_timestamp = rows[0]
+    return {"last_tx_hash": last_tx_hash, "last_block": last_block, "last_timestamp": last_timestamp}
+
+
+def ingest_wallet_transactions(blockchain, tx_hashes, addresses, values, cursor=None):
+    """Add new transactions to the running wallet totals and advance the chain's cursor atomically.
+
+    tx_hashes, addresses and values are parallel arrays (see wallet_aggregation.transactions_to_arrays);
+    hashes already ingested for the chain are skipped, so overlapping pages never count a
+    transaction twice. Returns the number of transactions that were new.
+    """
+    now = time.time()
+    tx_hashes = pd.Index(np.asarray(tx_hashes, dtype=object))
+    with transaction() as conn:
+        seen = []
+        unique_hashes = tx_hashes.unique()
+        for start in range(0, len(unique_hashes), SQL_VARIABLE_CHUNK):
+            chunk = list(unique_hashes[start:start + SQL_VARIABLE_CHUNK])
+            seen += [row[0] for row in conn.execute(
+                f"SELECT tx_hash FROM ingested_transactions WHERE blockchain = ? AND tx_hash IN ({','.join('?' * len(chunk))})",
+                [blockchain] + chunk,
+            )]
+        new = ~(tx_hashes.duplicated() | tx_hashes.isin(seen))
+        conn.executemany("INSERT INTO ingested_transactions (blockchain, tx_hash, ingested_at) VALUES (?, ?, ?)",
+                         ((blockchain, tx_hash, now) for tx_hash in tx_hashes[new]))
+
+        totals = aggregate_by_address(np.asarray(addresses, dtype=object)[new], np.asarray(values, dtype=np.float64)[new],
+                                      dust_value=config.DUST_TRANSACTION_VALUE)
+        updated_at = str(datetime.now())
+        conn.executemany(INCREMENT_WALLET_SQL, zip(totals["wallet_address"], [blockchain] * len(totals),
+                                                   totals["total_received"].tolist(), totals["transaction_count"].tolist(),
+                                                   totals["dust_free_received"].tolist(), totals["dust_free_count"].tolist(),
+                                                   [updated_at] * len(totals)))
+        if cursor is not None:
+            conn.execute(UPSERT_CURSOR_SQL, (blockchain, cursor.get("last_tx_hash"), cursor.get("last_block"),
+                                             cursor.get("last_timestamp")))
+        conn.execute("DELETE FROM ingested_transactions WHERE ingested_at < ?",
+                     (now - config.INGEST_DEDUP_RETENTION,))
+    return int(new.sum())
 
 
 def insert_wallet_activity(wallet_address, blockchain, first_funds_received, first_token, first_token_amount, remaining_balance, spending_pattern, highest_spend):
     """Insert wallet tracking data into the database."""
-    conn = sqlite3.connect("wallet_tracking.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO wallet_activity (wallet_address, blockchain, first_funds_received, first_token, first_token_amount, remaining_balance, spending_pattern, highest_spend)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (wallet_address, blockchain, first_funds_received, first_token, first_token_amount, remaining_balance, spending_pattern, highest_spend))
-    conn.commit()
-    conn.close()
-
-
-def fetch_all_trackers(blockchain):
-    """Fetch all wallet trackers from the database for the selected blockchain."""
-    conn = sqlite3.connect("wallet_tracking.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM wallet_activity WHERE blockchain = ?", (blockchain,))
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+    insert_wallet_activity_many([(wallet_address, blockchain, first_funds_received, first_token, first_token_amount, remaining_balance, spending_pattern, highest_spend)])
+
+
+def insert_wallet_activity_many(rows):
+    """Insert many wallet_activity rows (tuples in insert_wallet_activity's argument order) in one transaction."""
+    with transaction() as conn:
+        conn.executemany(INSERT_ACTIVITY_SQL, rows)
+
+
+def fetch_all_trackers(blockchain, include_archive=False):
+    """Fetch all wallet trackers from the database for the selected blockchain, newest first."""
+    if include_archive:
+        return query(TRACKERS_WITH_ARCHIVE_SQL, (blockchain, blockchain))
+    return query(TRACKERS_SQL, (blockchain,))
+
+
+def fetch_recent_wallets(blockchain, limit=100, skip_dust=False):
+    """Fetch the most recently updated wallets for a blockchain; with skip_dust, their dust-free totals."""
+    return query(RECENT_DUST_FREE_WALLETS_SQL if skip_dust else RECENT_WALLETS_SQL, (blockchain, limit))
+
+
+def _wallet_table(skip_dust):
+    return "wallets_dust_free" if skip_dust else "wallets"
+
+
+def recent_wallets_cutoff(blockchain, recent, skip_dust=False):
+    """last_updated of the chain's `recent`-th most recently updated wallet, to pass as updated_since.
+
+    One indexed lookup, so the Wallet Tracking queries filter on a plain range instead of each
+    re-sorting the chain. Wallets tied at the cutoff are all kept, so a scope may hold a few more
+    than `recent`. Returns None when the chain has fewer wallets, i.e. no cutoff is needed.
+    """
+    rows = query(RECENT_CUTOFF_SQL.format(table=_wallet_table(skip_dust)), (blockchain, recent - 1))
+    return rows[0][0] if rows else None
+
+
+def _wallet_scope(blockchain, category="all", updated_since=None, skip_dust=False, search=None):
+    """FROM ... WHERE clause and its params for a chain's wallets, as filtered on the Wallet Tracking page.
+
+    :param category: "all", "new" (fewer than REPEATED_BUYER_MIN_TRANSACTIONS receipts) or "potential" (repeated buyers)
+    :param updated_since: only wallets updated at or after this last_updated, e.g. from recent_wallets_cutoff()
+    :param skip_dust: use totals without receipts below config.DUST_TRANSACTION_VALUE, leaving out dust-only wallets
+    :param search: substring of the wallet address
+    """
+    sql, params = f"FROM {_wallet_table(skip_dust)} WHERE blockchain = ?", [blockchain]
+    if updated_since is not None:
+        sql += " AND last_updated >= ?"
+        params.append(updated_since)
+    if category == "new":
+        sql += " AND COALESCE(transaction_count, 0) < ?"
+        params.append(REPEATED_BUYER_MIN_TRANSACTIONS)
+    elif category == "potential":
+        sql += " AND +transaction_count >= ?"  # Unary + leaves the index choice to the chain and cutoff terms
+        params.append(REPEATED_BUYER_MIN_TRANSACTIONS)
+    elif category != "all":
+        raise ValueError(f"Unknown wallet category: {category}")
+    if search:
+        sql += " AND instr(wallet_address, ?) > 0"
+        params.append(search)
+    return sql, params
+
+
+def count_wallets(blockchain, category="all", updated_since=None, skip_dust=False, search=None):
+    """Number of wallets matching the Wallet Tracking filters (see _wallet_scope)."""
+    scope, params = _wallet_scope(blockchain, category, updated_since, skip_dust, search)
+    return query(f"SELECT COUNT(*) {scope}", params)[0][0]
+
+
+def count_wallets_by_category(blockchain, updated_since=None, skip_dust=False):
+    """Wallet counts for every category ("all", "new", "potential") in a single pass over the scope."""
+    scope, params = _wallet_scope(blockchain, "all", updated_since, skip_dust)
+    total, potential = query(f"SELECT COUNT(*), COALESCE(SUM(transaction_count >= ?), 0) {scope}",
+                             [REPEATED_BUYER_MIN_TRANSACTIONS] + params)[0]
+    return {"all": total, "new": total - potential, "potential": potential}
+
+
+def query_wallets(blockchain, category="all", updated_since=None, skip_dust=False, search=None,
+                  sort_by="total_received", descending=True, limit=50, offset=0):
+    """One page of a chain's wallets, filtered, sorted and sliced in SQL so only that page leaves the database.
+
+    Returns a DataFrame with WALLET_PAGE_COLUMNS.
+    """
+    if sort_by not in WALLET_SORT_COLUMNS:
+        raise ValueError(f"Cannot sort wallets by {sort_by}")
+    scope, params = _wallet_scope(blockchain, category, updated_since, skip_dust, search)
+    direction = "DESC" if descending else "ASC"
+    rows = query(f"SELECT {', '.join(WALLET_PAGE_COLUMNS)} {scope} ORDER BY {sort_by} {direction}, id {direction} LIMIT ? OFFSET ?",
+                 params + [limit, offset])
+    return pd.DataFrame(rows, columns=WALLET_PAGE_COLUMNS)
+
+
+def wallet_histogram(blockchain, category="all", updated_since=None, skip_dust=False, edges=None):
+    """Wallet count and total received per total-received bucket, aggregated in SQL.
+
+    Buckets are split at `edges` (config.WALLET_HISTOGRAM_EDGES by default); every bucket is returned, empty ones as 0.
+    """
+    edges = list(edges or config.WALLET_HISTOGRAM_EDGES)
+    scope, params = _wallet_scope(blockchain, category, updated_since, skip_dust)
+    bucket = "CASE " + " ".join(f"WHEN COALESCE(total_received, 0) < ? THEN {i}" for i in range(len(edges))) + f" ELSE {len(edges)} END"
+    rows = dict((row[0], row[1:]) for row in query(
+        f"SELECT {bucket} AS bucket, COUNT(*), COALESCE(SUM(total_received), 0) {scope} GROUP BY bucket", edges + params
+    ))
+    labels = [f"< {edges[0]:g}"] + [f"{low:g} – {high:g}" for low, high in zip(edges, edges[1:])] + [f">= {edges[-1]:g}"]
+    counts = [rows.get(i, (0, 0.0)) for i in range(len(labels))]
+    return pd.DataFrame({
+        "bucket": labels,
+        "wallets": [count for count, _ in counts],
+        "total_received": [total for _, total in counts],
+    })
+
+
+def archive_wallet_activity(retention_days=None, batch_size=10000):
+    """Move wallet_activity rows older than the retention window into wallet_activity_archive.
+
+    Rows move in batches, each in its own short transaction, so dashboard readers are never blocked for long.
+    """
+    retention_days = config.ACTIVITY_RETENTION_DAYS if retention_days is None else retention_days
+    params = (f"-{int(retention_days)} days", batch_size)
+    batch = "SELECT id FROM wallet_activity WHERE date < datetime('now', ?) ORDER BY id LIMIT ?"
+    moved = 0
+    while True:
+        with transaction() as conn:
+            conn.execute(f"INSERT INTO wallet_activity_archive SELECT * FROM wallet_activity WHERE id IN ({batch})", params)
+            count = conn.execute(f"DELETE FROM wallet_activity WHERE id IN ({batch})", params).rowcount
+        moved += count
+        if count < batch_size:
+            return moved
+
+
+# Queries the dashboard and monitors run, with sample parameters for check_query_plans()
+DASHBOARD_QUERIES = {
+    "fetch_all_trackers": (TRACKERS_SQL, ("ethereum",)),
+    "fetch_all_trackers_with_archive": (TRACKERS_WITH_ARCHIVE_SQL, ("ethereum", "ethereum")),
+    "fetch_recent_wallets": (RECENT_WALLETS_SQL, ("ethereum", 100)),
+    "fetch_recent_dust_free_wallets": (RECENT_DUST_FREE_WALLETS_SQL, ("ethereum", 100)),
+    "recent_wallets_cutoff": (RECENT_CUTOFF_SQL.format(table="wallets"), ("ethereum", 149)),
+    "wallet_page_by_received": (
+        "SELECT * FROM wallets WHERE blockchain = ? ORDER BY total_received DESC, id DESC LIMIT ? OFFSET ?", ("ethereum", 50, 0)
+    ),
+    "wallet_page_by_count": (
+        "SELECT * FROM wallets WHERE blockchain = ? ORDER BY transaction_count DESC, id DESC LIMIT ? OFFSET ?", ("ethereum", 50, 0)
+    ),
+    "dust_free_wallet_page_by_received": (
+        "SELECT * FROM wallets_dust_free WHERE blockchain = ? ORDER BY total_received DESC, id DESC LIMIT ? OFFSET ?",
+        ("ethereum", 50, 0)
+    ),
+    "wallet_lookup": ("SELECT * FROM wallets WHERE wallet_address = ? AND blockchain = ?", ("0x0", "ethereum")),
+    "wallet_activity_lookup": ("SELECT * FROM wallet_activity WHERE wallet_address = ? AND blockchain = ?", ("0x0", "ethereum")),
+    "new_wallets_by_chain": ("SELECT * FROM new_wallets WHERE blockchain = ? ORDER BY date DESC", ("ethereum",)),
+    "repeated_buyers_by_chain": ("SELECT * FROM repeated_buyers WHERE blockchain = ? ORDER BY date DESC", ("ethereum",)),
+}
+
+
+def check_query_plans():
+    """Run EXPLAIN QUERY PLAN on every dashboard query and flag full table scans or temp sorts."""
+    results = {}
+    for name, (sql, params) in DASHBOARD_QUERIES.items():
+        plan = [row[3] for row in query("EXPLAIN QUERY PLAN " + sql, params)]
+        full_scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+        temp_sorts = [step for step in plan if "TEMP B-TREE" in step]
+        results[name] = {"uses_index": not full_scans and not temp_sorts, "plan": plan}
+    return results
 
 
 # Example usage
 if __name__ == '__main__':
     create_wallet_activity_table()
     print(fetch_all_trackers("ethereum"))
+
+    for name, result in check_query_plans().items():
+        status = "✅" if result["uses_index"] else "🚨"
+        print(f"{status} {name}: {' | '.join(result['plan'])}")
@@ -0,0 +1,129 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_WINDOWS = {
+    "volatility": 3,
+    "momentum": 3,
+    "sma": (5,),
+    "ema": (5,),
+    "rsi": 14,
+}
+
+
+def _as_2d(prices):
+    prices = np.asarray(prices, dtype=np.float64)
+    return prices.reshape(-1, 1) if prices.ndim == 1 else prices
+
+
+def pct_change(prices):
+    """Percent change along the time axis; the first row is NaN."""
+    out = np.full_like(prices, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = prices[1:] / prices[:-1] - 1
+    return out
+
+
+def shift_diff(prices, periods):
+    """prices[t] - prices[t - periods]; the first `periods` rows are NaN."""
+    out = np.full_like(prices, np.nan)
+    if periods < len(prices):
+        out[periods:] = prices[periods:] - prices[:-periods]
+    return out
+
+
+def rolling_mean(values, window):
+    """Trailing rolling mean with pandas' min_periods=window semantics."""
+    out = np.full_like(values, np.nan)
+    if window <= len(values):
+        out[window - 1:] = sliding_window_view(values, window, axis=0).mean(axis=-1)
+    return out
+
+
+def rolling_std(values, window):
+    """Trailing rolling sample standard deviation (ddof=1, as in pandas)."""
+    out = np.full_like(values, np.nan)
+    if 1 < window <= len(values):
+        out[window - 1:] = sliding_window_view(values, window, axis=0).std(axis=-1, ddof=1)
+    return out
+
+
+def ema(values, span):
+    """Exponential moving average equivalent to pandas ewm(span=span, adjust=False)."""
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty_like(values)
+    out[0] = values[0]
+    for t in range(1, len(values)):
+        out[t] = alpha * values[t] + (1 - alpha) * out[t - 1]
+    return out
+
+
+def rsi(prices, window=14, method="wilder"):
+    """Relative Strength Index for every asset column.
+
+    method="wilder" uses Wilder's smoothing (seeded with a simple average of the
+    first `window` moves); method="sma" uses a simple rolling average of gains
+    and losses, as the AI trading features do.
+    """
+    delta = np.zeros_like(prices)
+    delta[1:] = np.diff(prices, axis=0)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    if method == "sma":
+        avg_gain = rolling_mean(gains, window)
+        avg_loss = rolling_mean(losses, window)
+    elif method == "wilder":
+        avg_gain = np.full_like(prices, np.nan)
+        avg_loss = np.full_like(prices, np.nan)
+        if window < len(prices):
+            avg_gain[window] = gains[1:window + 1].mean(axis=0)
+            avg_loss[window] = losses[1:window + 1].mean(axis=0)
+            for t in range(window + 1, len(prices)):
+                avg_gain[t] = (avg_gain[t - 1] * (window - 1) + gains[t]) / window
+                avg_loss[t] = (avg_loss[t - 1] * (window - 1) + losses[t]) / window
+    else:
+        raise ValueError(f"Unknown RSI method: {method}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def compute_features(prices, windows=None, rsi_method="wilder"):
+    """Compute trading features for many assets at once.
+
+    :param prices: 2-D array shaped (time, asset); a 1-D series is treated as one asset
+    :param windows: overrides for DEFAULT_WINDOWS
+    :param rsi_method: "wilder" or "sma"
+    :return: dict of feature name -> 2-D array shaped like prices
+    """
+    prices = _as_2d(prices)
+    windows = dict(DEFAULT_WINDOWS, **(windows or {}))
+
+    features = {
+        "price_change": pct_change(prices),
+        "volatility": rolling_std(prices, windows["volatility"]),
+        "momentum": shift_diff(prices, windows["momentum"]),
+    }
+    for window in windows["sma"]:
+        features[f"SMA_{window}"] = rolling_mean(prices, window)
+    for span in windows["ema"]:
+        features[f"EMA_{span}"] = ema(prices, span)
+    features["RSI"] = rsi(prices, windows["rsi"], rsi_method)
+    return features
+
+
+def backfill(features):
+    """Fill NaNs from the next valid row along the time axis, like DataFrame.bfill()."""
+    filled = {}
+    for name, values in features.items():
+        rows = np.arange(len(values))[:, None]
+        # Index of the next valid row at or after each position (last row if none)
+        next_valid = np.where(np.isnan(values), len(values) - 1, rows)
+        next_valid = np.minimum.accumulate(next_valid[::-1], axis=0)[::-1]
+        filled[name] = np.take_along_axis(values, next_valid, axis=0)
+    return filled
+
+
+def stack_features(features, names):
+    """Stack the named features into one (time, asset, feature) array for model scoring."""
+    return np.stack([features[name] for name in names], axis=-1)
@@ -1,16 +1,24 @@
-import websocket
-import json
-import time
-
-# WebSocket URL for exchange (e.g., Binance, Coinbase Pro)
-WEBSOCKET_URL = "wss://stream.binance.com:9443/ws/btcusdt@trade"
-
-def on_message(ws, message):
-    """Handles incoming WebSocket messages (trade updates)."""
-    trade = json.loads(message)
-    price = float(trade['p'])
-    quantity = float(trade['q'])
-    print(f"Trade Update - Price: {price}, Quantity: {quantity}")
+import sys
+import threading
+
+from risk_management import RiskTracker
+from tick_ingestion import BarBuilder, TickIngestor
+
+# Binance symbols to subscribe to on one combined stream (override on the command line)
+SYMBOLS = ["btcusdt", "ethusdt"]
+STATS_INTERVAL = 10  # Seconds between throughput reports
+
+risk_trackers = {}
+bar_builder = BarBuilder(interval_ms=60_000)
+
+def update_risk(batch, ingestor):
+    """Feed every tick in the batch to its symbol's O(1) risk tracker."""
+    for symbol_id, price in zip(batch["symbol"].tolist(), batch["price"].tolist()):
+        symbol = ingestor.symbols[symbol_id]
+        tracker = risk_trackers.get(symbol)
+        if tracker is None:
+            tracker = risk_trackers[symbol] = RiskTracker()
+        tracker.update(price)
     # Implement HFT logic here (market-making, arbitrage, etc.)
 
 def on_error(ws, error):
@@ -21,12 +29,24 @@ def on_close(ws, close_status_code, close_msg):
 
 def on_open(ws):
     print("WebSocket Connection Established")
-    # Can send subscription messages if needed
+
+def report_stats(ingestor, stop_event):
+    """Print throughput, lag and risk snapshots periodically instead of per trade."""
+    while not stop_event.wait(STATS_INTERVAL):
+        stats = ingestor.get_stats()
+        print(f"Ticks/s: {stats['ticks_per_second']:.0f}, avg lag: {stats['avg_lag_ms']:.0f}ms, "
+              f"max lag: {stats['max_lag_ms']}ms, buffered: {stats['buffered']}, dropped: {stats['dropped']}")
+        for symbol, tracker in list(risk_trackers.items()):  # update_risk adds trackers on the tick-dispatcher thread
+            print(f"  {symbol}: {tracker.snapshot()}")
 
 if __name__ == "__main__":
-    ws = websocket.WebSocketApp(WEBSOCKET_URL, 
-                                on_message=on_message,
-                                on_error=on_error,
-                                on_close=on_close)
-    ws.on_open = on_open
-    ws.run_forever()
+    ingestor = TickIngestor(sys.argv[1:] or SYMBOLS)
+    ingestor.add_consumer(bar_builder)
+    ingestor.add_consumer(update_risk)
+
+    stop_event = threading.Event()
+    threading.Thread(target=report_stats, args=(ingestor, stop_event), daemon=True).start()
+    try:
+        ingestor.start(on_open=on_open, on_error=on_error, on_close=on_close)
+    finally:
+        stop_event.set()
@@ -1,9 +1,19 @@
-import requests
+import http_client
+import transaction_store
+from seen_filter import get_seen_set
+from spender_leaderboard import SpenderLeaderboard
+from transaction_normalizer import iter_transactions, raw_transactions, transaction_hash
 import json
 import datetime
-from notifications import send_email_alert, send_telegram_alert, send_discord_alert
+import threading
+import time
+from notifications import send_alert
 
 SPENDING_DATA_FILE = "highest_spenders.json"
+LEADERBOARD_CHAINS = ["solana", "ethereum", "bsc", "bitcoin"]
+
+_leaderboard = None
+_leaderboard_lock = threading.Lock()
 
 def load_spending_data():
     """Load stored highest spending data."""
@@ -19,7 +29,7 @@ def save_spending_data(data):
         json.dump(data, file, indent=4)
 
 def fetch_transactions(blockchain):
-    """Fetch transactions for a given blockchain."""
+    """Fetch transactions for a given blockchain and add them to the local transaction store."""
     api_urls = {
         "solana": "https://api.solscan.io/transactions?limit=100",
         "ethereum": "https://api.etherscan.io/api?module=account&action=txlist&sort=desc",
@@ -28,39 +38,73 @@ def fetch_transactions(blockchain):
     }
 
     try:
-        response = requests.get(api_urls[blockchain.lower()]).json()
-        return response
+        transactions = raw_transactions(http_client.get(api_urls[blockchain.lower()]).json())
+        # Warm up before filtering and saving: the warm-up marks every stored hash seen, so the batch
+        # is neither loaded from the store nor added again below
+        leaderboard = get_leaderboard()
+        # Polls return overlapping snapshots (the Bitcoin mempool, the latest explorer page); skip repeats
+        seen_set, key = _seen_set(blockchain), lambda tx: transaction_hash(blockchain, tx)
+        transactions = seen_set.filter_new(transactions, key=key)
+        try:
+            transaction_store.save_transactions(blockchain, transactions)
+            leaderboard.add_transactions(iter_transactions(blockchain, transactions))
+        except Exception:
+            seen_set.discard(transactions, key=key)  # Not stored, so the next poll must not skip them
+            raise
+        return transactions
     except Exception as e:
         print(f"Error fetching transactions: {e}")
         return None
 
-def identify_highest_spenders(blockchain, selected_date=None):
-    """Identify the highest spending wallets for a given date."""
-    transactions = fetch_transactions(blockchain)
-    if not transactions:
-        return None
+def _seen_set(blockchain):
+    return get_seen_set(f"highest_spenders:{transaction_store.chain_key(blockchain)}")
+
+
+def _mark_seen(blockchain, records):
+    """Pass records through while marking their hashes seen, so a warm start does not count them again."""
+    seen_set = _seen_set(blockchain)
+    for tx in records:
+        seen_set.add(tx.hash)
+        yield tx
 
-    daily_spending = {}
-    today = selected_date if selected_date else datetime.datetime.utcnow().strftime("%Y-%m-%d")
 
-    for tx in transactions[:200]:  # Analyze last 200 transactions
-        timestamp = int(tx.get("timeStamp", 0))
-        tx_date = datetime.datetime.utcfromtimestamp(timestamp).strftime("%Y-%m-%d")
-        if tx_date != today:
-            continue  # Skip transactions from other dates
+def get_leaderboard():
+    """Process-wide rolling spender leaderboard, warmed from the transaction store on first use."""
+    global _leaderboard
+    if _leaderboard is None:
+        with _leaderboard_lock:
+            if _leaderboard is None:
+                leaderboard = SpenderLeaderboard()
+                since = time.time() - leaderboard.horizon
+                for chain in LEADERBOARD_CHAINS:
+                    leaderboard.add_transactions(_mark_seen(chain, transaction_store.iter_records(chain, start=since, oldest_first=True)))
+                _leaderboard = leaderboard
+    return _leaderboard
 
-        wallet = tx.get("from", "Unknown")
-        amount = float(tx.get("value", 0)) / 10**18 if blockchain != "bitcoin" else float(tx.get("value", 0))
 
-        if wallet not in daily_spending:
-            daily_spending[wallet] = 0
-        daily_spending[wallet] += amount
+def top_spenders(window="24h", n=100, blockchain=None, prices=None):
+    """Live top-n spenders for a rolling window ("1h", "24h", "7d"), on one chain or across all of them."""
+    chain = transaction_store.chain_key(blockchain) if blockchain else None
+    return [{"blockchain": chain, "wallet": wallet, "amount": amount}
+            for chain, wallet, amount in get_leaderboard().top(window, n, chain, prices)]
+
+
+def identify_highest_spenders(blockchain, selected_date=None, offline=False):
+    """Identify the highest spending wallet for a given date from the local transaction store.
+
+    Unless offline=True, the latest transactions are fetched into the store first.
+    """
+    if not offline:
+        fetch_transactions(blockchain)
+
+    today = selected_date if selected_date else datetime.datetime.utcnow().strftime("%Y-%m-%d")
+    day_start = int(datetime.datetime.strptime(today, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc).timestamp())
 
-    if not daily_spending:
+    senders = transaction_store.top_senders(blockchain, start=day_start, end=day_start + 86399, limit=1)
+    if not senders:
         return None
 
-    highest_spender = max(daily_spending, key=daily_spending.get)
-    highest_amount = daily_spending[highest_spender]
+    highest_spender, highest_amount, _ = senders[0]
 
     # Store highest spender data
     spending_data = load_spending_data()
@@ -73,9 +117,7 @@ def identify_highest_spenders(blockchain, selected_date=None):
 
     # Send alerts for highest spender
     message = f"🔥 Highest spender on {blockchain} for {today}: {highest_spender} spent {highest_amount:.2f} {blockchain.upper()}"
-    send_email_alert("Highest Spending Wallet Detected", message)
-    send_telegram_alert(message)
-    send_discord_alert(message)
+    send_alert("Highest Spending Wallet Detected", message)
 
     return spending_data[today]
 
@@ -0,0 +1,146 @@
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+import rate_limiter
+
+_sessions = {}  # retry_post -> session
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_host_stats = {}
+
+
+def _build_session(retry_post):
+    """Create a session with keep-alive pools and a retry policy for every host.
+
+    POSTs are only retried when retry_post is set, i.e. for read-only JSON-RPC calls;
+    retrying anything else (e.g. a webhook) could deliver it twice.
+    """
+    allowed_methods = Retry.DEFAULT_ALLOWED_METHODS | {"POST"} if retry_post else Retry.DEFAULT_ALLOWED_METHODS
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=config.HTTP_RETRY_STATUSES,
+        allowed_methods=allowed_methods,
+        respect_retry_after_header=False,  # 429s and their Retry-After are handled by the rate limiter in request()
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(retry_post=False):
+    """Return the process-wide pooled session, creating it on first use."""
+    session = _sessions.get(retry_post)
+    if session is None:
+        with _session_lock:
+            session = _sessions.get(retry_post)
+            if session is None:
+                session = _sessions[retry_post] = _build_session(retry_post)
+    return session
+
+
+def _record(url, elapsed, ok):
+    """Update per-host latency and connection reuse counters."""
+    host = urlsplit(url).netloc
+    try:
+        # Requests to one host can go through either session, so count the connections of both pools
+        with _session_lock:
+            sessions = list(_sessions.values())
+        connections_opened = sum(session.get_adapter(url).poolmanager.connection_from_url(url).num_connections
+                                 for session in sessions)
+    except Exception:
+        connections_opened = None
+
+    with _stats_lock:
+        stats = _host_stats.setdefault(host, {
+            "requests": 0,
+            "errors": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+            "connections_opened": 0,
+        })
+        stats["requests"] += 1
+        stats["total_latency"] += elapsed
+        stats["max_latency"] = max(stats["max_latency"], elapsed)
+        if not ok:
+            stats["errors"] += 1
+        if connections_opened is not None:
+            stats["connections_opened"] = connections_opened
+
+
+def _api_key(url, params):
+    """Find the apikey query parameter so each key gets its own rate budget."""
+    if isinstance(params, dict) and params.get("apikey"):
+        return params["apikey"]
+    values = parse_qs(urlsplit(url).query).get("apikey")
+    return values[0] if values and values[0] != "None" else None
+
+
+def request(method, url, max_wait=None, retry_post=False, **kwargs):
+    """Send a request through the shared pool with the configured default timeout.
+
+    Every request first takes a token from its provider's rate limit bucket;
+    429 responses pause that bucket and are retried up to RATE_LIMIT_MAX_RETRIES.
+    Raises rate_limiter.RateLimitExceeded if the wait would exceed max_wait.
+    Set retry_post only for read-only POSTs, so 5xx responses to them are retried too.
+    """
+    kwargs.setdefault("timeout", (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT))
+    bucket = rate_limiter.get_bucket(url, _api_key(url, kwargs.get("params")))
+
+    for _ in range(config.RATE_LIMIT_MAX_RETRIES + 1):
+        rate_limiter.acquire(bucket, max_wait)
+        start = time.perf_counter()
+        try:
+            response = get_session(retry_post).request(method, url, **kwargs)
+        except requests.RequestException:
+            _record(url, time.perf_counter() - start, ok=False)
+            raise
+        _record(url, time.perf_counter() - start, ok=response.ok)
+
+        if response.status_code != 429:
+            bucket.reset_backoff()
+            return response
+        bucket.backoff(rate_limiter.parse_retry_after(response.headers.get("Retry-After")))
+
+    return response
+
+
+def get(url, **kwargs):
+    """Pooled drop-in for requests.get."""
+    return request("GET", url, **kwargs)
+
+
+def post(url, retry_post=False, **kwargs):
+    """Pooled drop-in for requests.post; pass retry_post=True for read-only JSON-RPC calls only."""
+    return request("POST", url, retry_post=retry_post, **kwargs)
+
+
+def get_host_stats():
+    """Return a snapshot of per-host counters including average latency and reused connections."""
+    with _stats_lock:
+        snapshot = {}
+        for host, stats in _host_stats.items():
+            entry = dict(stats)
+            entry["avg_latency"] = stats["total_latency"] / stats["requests"] if stats["requests"] else 0.0
+            entry["reused_connections"] = max(stats["requests"] - stats["connections_opened"], 0)
+            snapshot[host] = entry
+        return snapshot
+
+
+def reset_host_stats():
+    """Clear all per-host counters."""
+    with _stats_lock:
+        _host_stats.clear()
@@ -1,5 +1,8 @@
-import requests
+import http_client
 import pandas as pd
+import price_store
+import chain_sketches
+from transaction_normalizer import chain_key
 import time
 
 BLOCKCHAIN_API_URLS = {
@@ -10,13 +13,21 @@ BLOCKCHAIN_API_URLS = {
 }
 
 def get_real_time_data(blockchain):
-    """Fetch real-time blockchain analytics (transactions, volume, active wallets)."""
-    blockchain = blockchain.lower()
-    
+    """Real-time blockchain analytics (transactions, volume, active wallets) for the last 24 hours.
+
+    Served from our own transaction sketches when they have data; otherwise from the chain's public stats API.
+    """
+    blockchain = chain_key(blockchain)
+
+    summary = chain_sketches.get_chain_summary(blockchain)
+    if summary["total_transactions"]:
+        summary["transactions"] = []
+        return summary
+
     if blockchain not in BLOCKCHAIN_API_URLS:
         return None
     
-    response = requests.get(BLOCKCHAIN_API_URLS[blockchain])
+    response = http_client.get(BLOCKCHAIN_API_URLS[blockchain])
     
     if response.status_code != 200:
         return None
@@ -62,7 +73,7 @@ def get_crypto_prices():
         "ids": "bitcoin,ethereum,solana,binancecoin",
         "vs_currencies": "usd"
     }
-    response = requests.get(COINGECKO_API_URL, params=params)
+    response = http_client.get(COINGECKO_API_URL, params=params)
     return response.json()
 
 def process_price_data(data):
@@ -84,29 +95,20 @@ def safe_get_historical_prices(crypto, days=180):
     return get_historical_prices(crypto, days=days)
 
 
-def get_historical_prices(crypto, days=180, retries=3):
-    """Fetch historical price data with retry mechanism."""
-    url = f"https://api.coingecko.com/api/v3/coins/{crypto}/market_chart?vs_currency=usd&days={days}"
-    
-    for attempt in range(retries):
-        response = requests.get(url)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return process_price_data(data)  # Convert API response to DataFrame
-        
-        elif response.status_code == 429:  # Rate limit exceeded
-            wait_time = (2 ** attempt) * 5  # Exponential backoff
-            print(f"🚨 API Rate Limit Exceeded! Retrying in {wait_time} seconds... (Attempt {attempt+1}/{retries})")
-            time.sleep(wait_time)
-        else:
-            print(f"🚨 API Error {response.status_code}: {response.text}")
-            break  # Stop retrying if it's another error
-    
-    print("🚨 Error: Unable to fetch historical data!")
-    return pd.DataFrame()  # Return an empty DataFrame on failure
+def get_historical_prices(crypto, days=180):
+    """Fetch historical price data indexed by timestamp, served from the local price store."""
+    end_timestamp = int(time.time())
+    df = price_store.get_prices(crypto, end_timestamp - days * 24 * 60 * 60, end_timestamp)
+
+    if df.empty:
+        print("🚨 Error: Unable to fetch historical data!")
+        return pd.DataFrame()  # Return an empty DataFrame on failure
+
+    df.set_index("timestamp", inplace=True)
+    return df
 
 # Example Usage:
-crypto = "bitcoin"
-df = get_historical_prices(crypto, days=180)
-print(df.head())  # Verify data output
+if __name__ == "__main__":
+    crypto = "bitcoin"
+    df = get_historical_prices(crypto, days=180)
+    print(df.head())  # Verify data output
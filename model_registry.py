@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import time
+
+import joblib
+
+import config
+
+_models = {}
+_lock = threading.Lock()
+
+
+def _paths(coin):
+    base = os.path.join(config.MODEL_REGISTRY_DIR, coin)
+    return f"{base}.joblib", f"{base}.json"
+
+
+def save_model(coin, model, scaler, metadata):
+    """Persist a fitted model+scaler pair with its metadata and make it the warm in-process model."""
+    os.makedirs(config.MODEL_REGISTRY_DIR, exist_ok=True)
+    model_path, meta_path = _paths(coin)
+    metadata = dict(metadata, coin=coin, trained_at=time.time())
+
+    # Write to temp files first so a crash never leaves a half-written model behind
+    joblib.dump((model, scaler), model_path + ".tmp")
+    with open(meta_path + ".tmp", "w") as file:
+        json.dump(metadata, file, indent=4)
+    os.replace(model_path + ".tmp", model_path)
+    os.replace(meta_path + ".tmp", meta_path)
+
+    with _lock:
+        _models[coin] = (model, scaler, metadata)
+    return metadata
+
+
+def load_model(coin):
+    """Return (model, scaler, metadata) from memory, loading it from disk on first use."""
+    entry = _models.get(coin)
+    if entry is not None:
+        return entry
+
+    model_path, meta_path = _paths(coin)
+    if not (os.path.exists(model_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        model, scaler = joblib.load(model_path)
+        with open(meta_path, "r") as file:
+            metadata = json.load(file)
+    except Exception as e:
+        print(f"⚠️ Failed to load model for {coin}: {e}")
+        return None
+
+    with _lock:
+        _models.setdefault(coin, (model, scaler, metadata))
+        return _models[coin]
+
+
+def needs_retrain(metadata, features, latest_timestamp=None):
+    """Check the retrain schedule, the feature list and how much new data has arrived since the watermark."""
+    if metadata.get("features") != list(features):
+        return True
+    if time.time() - metadata.get("trained_at", 0) >= config.MODEL_RETRAIN_INTERVAL:
+        return True
+    if latest_timestamp is not None and latest_timestamp - metadata.get("data_watermark", 0) >= config.MODEL_RETRAIN_NEW_DATA:
+        return True
+    return False
+
+
+def evict(coin=None):
+    """Drop warm models from memory (all of them if no coin is given); files on disk are kept."""
+    with _lock:
+        if coin is None:
+            _models.clear()
+        else:
+            _models.pop(coin, None)
@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+# Per-wallet tracker state written by wallet_monitor.py
+TRACKER_TABLES = ("first_deposits", "first_token_purchases", "solana_balances")
+
+# JSON files used before the SQLite store, imported once by migrate_from_json()
+LEGACY_JSON_FILES = {
+    "new_wallets": "new_wallets.json",
+    "first_deposits": "first_deposits.json",
+    "first_token_purchases": "first_token_purchases.json",
+    "solana_balances": "solana_remaining_balances.json",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS new_wallets (
+    wallet TEXT PRIMARY KEY,
+    blockchain TEXT NOT NULL,
+    detected_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_new_wallets_blockchain ON new_wallets (blockchain, wallet);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+""" + "".join(f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    wallet TEXT PRIMARY KEY,
+    blockchain TEXT,
+    data TEXT,
+    updated_at REAL NOT NULL
+);
+""" for table in TRACKER_TABLES)
+
+_local = threading.local()
+
+
+def _get_connection():
+    """Return this thread's connection to the monitor store, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(config.MONITOR_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _check_table(table):
+    if table not in TRACKER_TABLES:
+        raise ValueError(f"Unknown tracker table: {table}")
+
+
+def add_new_wallets(wallets):
+    """Insert (wallet, blockchain) pairs not seen before and return only the newly added ones."""
+    wallets = list(dict(wallets).items())
+    if not wallets:
+        return []
+    conn = _get_connection()
+    added = []
+    now = time.time()
+    with conn:
+        for wallet, blockchain in wallets:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO new_wallets (wallet, blockchain, detected_at) VALUES (?, ?, ?)",
+                (wallet, blockchain, now),
+            )
+            if cursor.rowcount:
+                added.append((wallet, blockchain))
+    return added
+
+
+def wallets_missing_from(table, blockchain=None):
+    """Return (wallet, blockchain) pairs from new_wallets that have no row in a tracker table yet."""
+    _check_table(table)
+    query = f"SELECT n.wallet, n.blockchain FROM new_wallets n LEFT JOIN {table} t ON t.wallet = n.wallet WHERE t.wallet IS NULL"
+    params = ()
+    if blockchain is not None:
+        query += " AND n.blockchain = ?"
+        params = (blockchain,)
+    return _get_connection().execute(query, params).fetchall()
+
+
+def upsert(table, rows):
+    """Insert or update (wallet, blockchain, data) rows in one transaction; data is stored as JSON."""
+    _check_table(table)
+    now = time.time()
+    conn = _get_connection()
+    with conn:
+        conn.executemany(
+            f"""INSERT INTO {table} (wallet, blockchain, data, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(wallet) DO UPDATE SET blockchain = excluded.blockchain, data = excluded.data, updated_at = excluded.updated_at""",
+            [(wallet, blockchain, json.dumps(data), now) for wallet, blockchain, data in rows],
+        )
+
+
+def get_entry(table, wallet):
+    """Return the stored data for one wallet, or None."""
+    _check_table(table)
+    row = _get_connection().execute(f"SELECT data FROM {table} WHERE wallet = ?", (wallet,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def get_new_wallets(blockchain=None):
+    """Return {wallet: blockchain}, optionally for one chain only."""
+    conn = _get_connection()
+    if blockchain is None:
+        return dict(conn.execute("SELECT wallet, blockchain FROM new_wallets"))
+    return dict(conn.execute("SELECT wallet, blockchain FROM new_wallets WHERE blockchain = ?", (blockchain,)))
+
+
+def migrate_from_json(directory="."):
+    """One-shot import of the legacy JSON state files; does nothing once it has run."""
+    conn = _get_connection()
+    if conn.execute("SELECT 1 FROM store_meta WHERE key = 'json_migrated'").fetchone():
+        return False
+
+    def load(name):
+        path = os.path.join(directory, LEGACY_JSON_FILES[name])
+        try:
+            with open(path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    now = time.time()
+    new_wallets = load("new_wallets")
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO new_wallets (wallet, blockchain, detected_at) VALUES (?, ?, ?)",
+            [(wallet, blockchain, now) for wallet, blockchain in new_wallets.items()],
+        )
+        for table in TRACKER_TABLES:
+            rows = []
+            for wallet, data in load(table).items():
+                blockchain = data.get("blockchain") if isinstance(data, dict) else new_wallets.get(wallet)
+                rows.append((wallet, blockchain, json.dumps(data), now))
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {table} (wallet, blockchain, data, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        conn.execute("INSERT INTO store_meta (key, value) VALUES ('json_migrated', ?)", (str(now),))
+    print(f"✅ Migrated {len(new_wallets)} wallets from JSON into {config.MONITOR_STORE_PATH}")
+    return True
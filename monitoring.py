@@ -1,11 +1,11 @@
-import requests
+import http_client
 
 BINANCE_TRADE_HISTORY_URL = "https://api.binance.com/api/v3/trades?symbol=BTCUSDT"
 
 def get_trade_history(limit=10):
     """Fetch recent Bitcoin trades from Binance."""
     try:
-        response = requests.get(BINANCE_TRADE_HISTORY_URL, params={"limit": limit})
+        response = http_client.get(BINANCE_TRADE_HISTORY_URL, params={"limit": limit})
         trades = response.json()
         trade_data = [
             {
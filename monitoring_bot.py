@@ -2,6 +2,7 @@ import time
 import schedule
 from wallet_registration_tracker import detect_new_wallet_activity
 from notifications import send_daily_report, send_trade_alerts
+from database import archive_wallet_activity
 
 def run_monitoring():
     """Continuously check for new wallets and send alerts."""
@@ -13,6 +14,7 @@ def run_monitoring():
 schedule.every(10).minutes.do(run_monitoring)
 schedule.every().hour.do(send_trade_alerts)
 schedule.every().day.at("00:00").do(send_daily_report)
+schedule.every().day.at("03:00").do(archive_wallet_activity)  # Keep wallet_activity within its retention window
 
 if __name__ == "__main__":
     print("🚀 Monitoring Bot Started")
@@ -1,8 +1,11 @@
+import atexit
+import queue
 import smtplib
-import discord
-import telebot
+import threading
+import time
 import os
-import requests
+import http_client
+import config
 
 # Load credentials from environment variables
 EMAIL_USER = os.getenv("EMAIL_USER")
@@ -16,45 +19,163 @@ def notify_wallet_event(event_details):
     """Send notifications for wallet events."""
     message = f"🔔 Wallet Event: {event_details}"
     print(message)
-    send_email_alert("Wallet Event Notification", message)
-    send_telegram_alert(message)
-    send_discord_alert(message)
+    send_alert("Wallet Event Notification", message)
+
+
+class NotificationDispatcher:
+    """Background delivery of alerts over long-lived SMTP, Telegram and Discord clients.
+
+    Each channel has its own bounded queue and a fixed number of worker threads
+    (its concurrency limit). Failed deliveries are retried with backoff inside
+    the worker, so callers only pay for a queue put.
+    """
+
+    def __init__(self):
+        self.queues = {channel: queue.Queue(maxsize=config.NOTIFY_QUEUE_SIZE) for channel in config.NOTIFY_WORKERS}
+        self.stats = {channel: {"queued": 0, "delivered": 0, "failed": 0, "dropped": 0, "retries": 0,
+                                "total_latency": 0.0, "max_latency": 0.0} for channel in config.NOTIFY_WORKERS}
+        self._stats_lock = threading.Lock()
+        self._telegram_bot = None
+        self._local = threading.local()  # One SMTP connection per email worker
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            for channel, workers in config.NOTIFY_WORKERS.items():
+                for i in range(workers):
+                    threading.Thread(target=self._worker, args=(channel,), name=f"notify-{channel}-{i}", daemon=True).start()
+            self._started = True
+
+    def enqueue(self, channel, *payload):
+        """Queue an alert without blocking; returns False if the channel's queue is full."""
+        self.start()
+        try:
+            self.queues[channel].put_nowait((time.monotonic(), payload))
+        except queue.Full:
+            self._count(channel, "dropped")
+            print(f"⚠️ {channel.capitalize()} queue full, alert dropped")
+            return False
+        self._count(channel, "queued")
+        return True
+
+    def _count(self, channel, key, amount=1):
+        with self._stats_lock:
+            self.stats[channel][key] += amount
+
+    def _worker(self, channel):
+        deliver = getattr(self, f"_deliver_{channel}")
+        while True:
+            enqueued_at, payload = self.queues[channel].get()
+            try:
+                for attempt in range(config.NOTIFY_MAX_RETRIES + 1):
+                    try:
+                        deliver(*payload)
+                        latency = time.monotonic() - enqueued_at
+                        with self._stats_lock:
+                            stats = self.stats[channel]
+                            stats["delivered"] += 1
+                            stats["total_latency"] += latency
+                            stats["max_latency"] = max(stats["max_latency"], latency)
+                        break
+                    except Exception as e:
+                        if attempt == config.NOTIFY_MAX_RETRIES:
+                            self._count(channel, "failed")
+                            print(f"⚠️ {channel.capitalize()} alert failed: {e}")
+                        else:
+                            self._count(channel, "retries")
+                            time.sleep(config.NOTIFY_RETRY_BACKOFF * 2 ** attempt)
+            finally:
+                self.queues[channel].task_done()
+
+    def _deliver_email(self, subject, body):
+        server = getattr(self._local, "smtp", None)
+        try:
+            if server is None:
+                server = smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=config.NOTIFY_SMTP_TIMEOUT)
+                server.login(EMAIL_USER, EMAIL_PASS)
+                self._local.smtp = server
+            message = f"Subject: {subject}\n\n{body}"
+            server.sendmail(EMAIL_USER, EMAIL_USER, message)
+        except (smtplib.SMTPException, OSError):
+            # Idle connections get dropped by the server, and a failed login leaves one open; reconnect next attempt
+            self._local.smtp = None
+            if server is not None:
+                server.close()
+            raise
+        print("📩 Email sent successfully!")
+
+    def _deliver_telegram(self, message):
+        if self._telegram_bot is None:
+            import telebot  # Deferred: slow to import and only needed once Telegram is used
+            self._telegram_bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN)
+        self._telegram_bot.send_message(TELEGRAM_CHAT_ID, message)
+        print("📩 Telegram message sent!")
+
+    def _deliver_discord(self, message):
+        # Not a read-only call, so urllib3 must not retry it: the worker's retry loop is the only one,
+        # and a webhook retried in both layers could post the same alert several times
+        response = http_client.post(DISCORD_WEBHOOK_URL, retry_post=False, json={"content": message})
+        if response.status_code != 204:
+            raise RuntimeError(response.text)
+        print("📩 Discord message sent!")
+
+    def flush(self, timeout=None):
+        """Wait until every queued alert has been delivered or given up on; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while any(q.unfinished_tasks for q in self.queues.values()):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def get_stats(self):
+        """Queue depth, delivery counters and average/max delivery latency per channel."""
+        with self._stats_lock:
+            snapshot = {}
+            for channel, stats in self.stats.items():
+                entry = dict(stats)
+                entry["queue_depth"] = self.queues[channel].qsize()
+                entry["avg_latency"] = stats["total_latency"] / stats["delivered"] if stats["delivered"] else 0.0
+                snapshot[channel] = entry
+            return snapshot
+
+
+_dispatcher = NotificationDispatcher()
+atexit.register(lambda: _dispatcher.flush(timeout=config.NOTIFY_FLUSH_TIMEOUT))
+
+def get_dispatcher():
+    return _dispatcher
 
 
 # Email Notification
 def send_email_alert(subject, body):
-    try:
-        server = smtplib.SMTP_SSL("smtp.gmail.com", 465)
-        server.login(EMAIL_USER, EMAIL_PASS)
-        message = f"Subject: {subject}\n\n{body}"
-        server.sendmail(EMAIL_USER, EMAIL_USER, message)
-        server.quit()
-        print("📩 Email sent successfully!")
-    except Exception as e:
-        print(f"⚠️ Email sending failed: {e}")
+    if not (EMAIL_USER and EMAIL_PASS):
+        return False
+    return _dispatcher.enqueue("email", subject, body)
 
 
 # Telegram Notification
 def send_telegram_alert(message):
-    try:
-        bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN)
-        bot.send_message(TELEGRAM_CHAT_ID, message)
-        print("📩 Telegram message sent!")
-    except Exception as e:
-        print(f"⚠️ Telegram message failed: {e}")
+    if not (TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID):
+        return False
+    return _dispatcher.enqueue("telegram", message)
 
 
 # Discord Notification
 def send_discord_alert(message):
-    try:
-        data = {"content": message}
-        response = requests.post(DISCORD_WEBHOOK_URL, json=data)
-        if response.status_code == 204:
-            print("📩 Discord message sent!")
-        else:
-            print(f"⚠️ Discord message failed: {response.text}")
-    except Exception as e:
-        print(f"⚠️ Discord message failed: {e}")
+    if not DISCORD_WEBHOOK_URL:
+        return False
+    return _dispatcher.enqueue("discord", message)
+
+
+# All configured channels
+def send_alert(subject, message):
+    send_email_alert(subject, message)
+    send_telegram_alert(message)
+    send_discord_alert(message)
 
 
 # Example Alert
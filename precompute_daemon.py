@@ -0,0 +1,135 @@
+"""Long-running service that refreshes the dashboard's data and publishes it as snapshots.
+
+Each job runs in its own thread on its own cadence (config.PRECOMPUTE_INTERVALS), so a slow
+explorer never delays price refreshes. app.py reads the published snapshots, so page loads
+never wait on an upstream API and any number of dashboard users share one fetch per interval.
+
+Usage: python precompute_daemon.py [--once] [job ...]
+"""
+import sys
+import threading
+import time
+
+import config
+import historical_tracking
+import highest_spenders
+import market_data
+import snapshot_store
+import wallet_tracker
+from risk_management import calculate_risk_metrics
+from transaction_normalizer import chain_key
+
+COINS = ["bitcoin", "ethereum", "solana", "binancecoin"]  # CoinGecko ids on the dashboard
+CHAINS = ["bitcoin", "ethereum", "solana", "binance smart chain"]
+RECENT_PRICE_DAYS = (1, 7)  # Price trend ranges on the Home page
+RISK_METRICS_DAYS = 180
+
+
+def _for_each(items, job):
+    """Run job(item) for every item; one failing chain or coin does not stop the rest."""
+    for item in items:
+        try:
+            job(item)
+        except Exception as e:
+            print(f"🚨 Precompute failed for {item}: {e}")
+
+
+def refresh_crypto_prices():
+    snapshot_store.publish("crypto_prices", "", market_data.get_crypto_prices())
+
+
+def refresh_real_time_data():
+    _for_each(CHAINS, lambda chain: snapshot_store.publish("real_time_data", chain, market_data.get_real_time_data(chain)))
+
+
+def refresh_recent_prices():
+    def refresh(coin):
+        end_timestamp = int(time.time())
+        for days in RECENT_PRICE_DAYS:
+            prices = historical_tracking.get_historical_prices(coin, end_timestamp - days * 24 * 60 * 60, end_timestamp)
+            snapshot_store.publish("recent_prices", f"{coin}:{days}", prices)
+    _for_each(COINS, refresh)
+
+
+def refresh_tracked_wallets():
+    def refresh(chain):
+        # The dashboard pages through the wallet database itself; the snapshot records when it was last brought up to date
+        new_transactions = wallet_tracker.ingest_new_transactions(chain)
+        if new_transactions is not None:
+            snapshot_store.publish("tracked_wallets", chain, {"new_transactions": new_transactions})
+    _for_each([chain for chain in CHAINS if chain in wallet_tracker.BLOCKCHAIN_APIS], refresh)
+
+
+def refresh_leaderboard():
+    def refresh(chain):
+        highest_spenders.fetch_transactions(chain)
+        for window in config.LEADERBOARD_WINDOWS:
+            spenders = highest_spenders.top_spenders(window, config.PRECOMPUTE_LEADERBOARD_SIZE, chain)
+            snapshot_store.publish("leaderboard", f"{chain_key(chain)}:{window}", spenders)
+    _for_each(highest_spenders.LEADERBOARD_CHAINS, refresh)
+
+
+def refresh_risk_metrics():
+    def refresh(coin):
+        prices = market_data.get_historical_prices(coin, days=RISK_METRICS_DAYS)
+        if not prices.empty:
+            snapshot_store.publish("risk_metrics", coin, dict(calculate_risk_metrics(prices), days=RISK_METRICS_DAYS))
+    _for_each(COINS, refresh)
+
+
+JOBS = {
+    "crypto_prices": refresh_crypto_prices,
+    "real_time_data": refresh_real_time_data,
+    "recent_prices": refresh_recent_prices,
+    "tracked_wallets": refresh_tracked_wallets,
+    "leaderboard": refresh_leaderboard,
+    "risk_metrics": refresh_risk_metrics,
+}
+
+
+def run_job(name):
+    """Run one job once, logging instead of raising so the schedule keeps going."""
+    started = time.monotonic()
+    try:
+        JOBS[name]()
+        print(f"✅ {name} refreshed in {time.monotonic() - started:.1f}s")
+    except Exception as e:
+        print(f"🚨 Precompute job {name} failed: {e}")
+
+
+def _job_loop(name, stop):
+    while not stop.is_set():
+        started = time.monotonic()
+        run_job(name)
+        stop.wait(max(0.0, config.PRECOMPUTE_INTERVALS[name] - (time.monotonic() - started)))
+
+
+def run(names=None):
+    """Run the given jobs (all by default) on their intervals until interrupted."""
+    stop = threading.Event()
+    threads = [threading.Thread(target=_job_loop, args=(name, stop), name=f"precompute-{name}", daemon=True)
+               for name in names or JOBS]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stopping precompute daemon...")
+        stop.set()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    once = "--once" in args
+    names = [arg for arg in args if arg != "--once"]
+    unknown = [name for name in names if name not in JOBS]
+    if unknown:
+        sys.exit(f"Unknown job(s): {', '.join(unknown)}. Jobs: {', '.join(JOBS)}")
+
+    if once:
+        for name in names or JOBS:
+            run_job(name)
+    else:
+        print("🚀 Precompute daemon started")
+        run(names)
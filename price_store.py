@@ -0,0 +1,177 @@
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+import config
+import http_client
+from rate_limiter import RateLimitExceeded
+
+COINGECKO_RANGE_URL = "https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart/range"
+
+# Resolution -> (bucket size in seconds, longest range CoinGecko serves at that granularity)
+RESOLUTIONS = {
+    "5m": (300, 24 * 3600),
+    "hourly": (3600, 90 * 24 * 3600),
+    "daily": (24 * 3600, None),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    coin TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    price REAL NOT NULL,
+    PRIMARY KEY (coin, resolution, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS price_coverage (
+    coin TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_price_coverage ON price_coverage (coin, resolution, start_ts);
+"""
+
+_local = threading.local()
+
+
+def _get_connection():
+    """Return this thread's connection to the price store, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(config.PRICE_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def resolution_for_span(seconds):
+    """Pick the resolution CoinGecko would return for a range of this length."""
+    if seconds <= RESOLUTIONS["5m"][1]:
+        return "5m"
+    if seconds <= RESOLUTIONS["hourly"][1]:
+        return "hourly"
+    return "daily"
+
+
+def _missing_ranges(conn, coin_id, resolution, start, end, min_gap):
+    """Return the sub-ranges of [start, end] (seconds) not yet fetched from the API."""
+    covered = conn.execute(
+        "SELECT start_ts, end_ts FROM price_coverage WHERE coin = ? AND resolution = ? AND end_ts >= ? AND start_ts <= ? ORDER BY start_ts",
+        (coin_id, resolution, start, end),
+    ).fetchall()
+
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_start > cursor:
+            gaps.append((cursor, min(covered_start, end)))
+        cursor = max(cursor, covered_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return [(s, e) for s, e in gaps if e - s >= min_gap]
+
+
+def _add_coverage(conn, coin_id, resolution, start, end):
+    """Record [start, end] as fetched, merging it with overlapping or adjacent ranges."""
+    overlapping = conn.execute(
+        "SELECT rowid, start_ts, end_ts FROM price_coverage WHERE coin = ? AND resolution = ? AND end_ts >= ? AND start_ts <= ?",
+        (coin_id, resolution, start, end),
+    ).fetchall()
+    for rowid, covered_start, covered_end in overlapping:
+        start = min(start, covered_start)
+        end = max(end, covered_end)
+    conn.executemany("DELETE FROM price_coverage WHERE rowid = ?", [(row[0],) for row in overlapping])
+    conn.execute(
+        "INSERT INTO price_coverage (coin, resolution, start_ts, end_ts) VALUES (?, ?, ?, ?)",
+        (coin_id, resolution, start, end),
+    )
+
+
+def _fetch_range(coin_id, start, end):
+    """Fetch raw [timestamp_ms, price] points from CoinGecko, or None if the request failed."""
+    try:
+        response = http_client.get(
+            COINGECKO_RANGE_URL.format(coin_id=coin_id),
+            params={"vs_currency": "usd", "from": start, "to": end},
+        )
+    except RateLimitExceeded as e:
+        print(f"🚨 API Rate Limit Exceeded! {e}")
+        return None
+    except Exception as e:
+        print(f"🚨 Error fetching prices for {coin_id}: {e}")
+        return None
+
+    if response.status_code != 200:
+        print(f"🚨 API Error {response.status_code}: {response.text}")
+        return None
+    return response.json().get("prices", [])
+
+
+def _fill_gap(conn, coin_id, resolution, start, end):
+    """Fetch one missing range in API-sized chunks and store it bucketed to the resolution."""
+    step, max_span = RESOLUTIONS[resolution]
+    bucket_ms = step * 1000
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(end, chunk_start + max_span) if max_span else end
+        points = _fetch_range(coin_id, chunk_start, chunk_end)
+        if points is None:
+            return  # Leave the rest uncovered so the next call retries it
+
+        # Finer-grained points (short gaps) collapse to the last price in each bucket
+        rows = {}
+        for timestamp, price in points:
+            if price is not None:
+                rows[int(timestamp) // bucket_ms * bucket_ms] = price
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices (coin, resolution, timestamp, price) VALUES (?, ?, ?, ?)",
+                [(coin_id, resolution, ts, price) for ts, price in rows.items()],
+            )
+            _add_coverage(conn, coin_id, resolution, chunk_start, chunk_end)
+        chunk_start = chunk_end
+
+
+def get_prices(coin_id, start_timestamp, end_timestamp, resolution=None):
+    """Return a DataFrame of timestamp/price for the range, fetching only gaps missing from the local store."""
+    end = int(min(end_timestamp, time.time()))
+    start = int(start_timestamp)
+    if start >= end:
+        return pd.DataFrame()
+
+    resolution = resolution or resolution_for_span(end - start)
+    step, _ = RESOLUTIONS[resolution]
+    conn = _get_connection()
+
+    min_gap = min(step, config.PRICE_STORE_MAX_STALENESS)
+    for gap_start, gap_end in _missing_ranges(conn, coin_id, resolution, start, end, min_gap):
+        _fill_gap(conn, coin_id, resolution, gap_start, gap_end)
+
+    df = pd.read_sql_query(
+        "SELECT timestamp, price FROM prices WHERE coin = ? AND resolution = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp",
+        conn,
+        params=(coin_id, resolution, start // step * step * 1000, end * 1000),
+    )
+    if df.empty:
+        return pd.DataFrame()
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def clear_prices(coin_id=None):
+    """Drop stored prices and coverage, for one coin or everything."""
+    conn = _get_connection()
+    with conn:
+        if coin_id is None:
+            conn.execute("DELETE FROM prices")
+            conn.execute("DELETE FROM price_coverage")
+        else:
+            conn.execute("DELETE FROM prices WHERE coin = ?", (coin_id,))
+            conn.execute("DELETE FROM price_coverage WHERE coin = ?", (coin_id,))
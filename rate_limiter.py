@@ -0,0 +1,149 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+import config
+
+
+class RateLimitExceeded(requests.RequestException):
+    """Raised when a request would have to wait longer than its allowed budget.
+
+    retry_in is the number of seconds until the bucket's next free slot, so callers can schedule a retry.
+    """
+
+    def __init__(self, *args, retry_in=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Token bucket with reservation queueing and server-driven backoff."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.consecutive_429s = 0
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "dropped": 0, "rate_limited": 0}
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, max_wait=None):
+        """Reserve a token and return how long the caller must wait before using it.
+
+        Tokens may go negative so that each caller takes its place in the queue
+        and waits only for its own slot. Raises RateLimitExceeded instead of
+        queueing when the wait would exceed max_wait.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(-(self.tokens - 1) / self.rate, self.blocked_until - now, 0.0)
+            if max_wait is not None and wait > max_wait:
+                self.stats["dropped"] += 1
+                raise RateLimitExceeded(f"Rate limit budget exhausted, next slot in {wait:.1f}s", retry_in=wait)
+            self.tokens -= 1
+            self.stats["requests"] += 1
+            if wait > 0:
+                self.stats["throttled"] += 1
+            return wait
+
+    def backoff(self, retry_after=None):
+        """Pause the bucket after a 429, honouring Retry-After or using jittered exponential backoff."""
+        with self.lock:
+            self.consecutive_429s += 1
+            self.stats["rate_limited"] += 1
+            if retry_after is None:
+                ceiling = min(config.RATE_LIMIT_BACKOFF_BASE * 2 ** (self.consecutive_429s - 1), config.RATE_LIMIT_BACKOFF_CAP)
+                retry_after = random.uniform(ceiling / 2, ceiling)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self.tokens = min(self.tokens, 0)
+
+    def reset_backoff(self):
+        with self.lock:
+            self.consecutive_429s = 0
+
+
+_buckets = {}
+_overrides = {}
+_buckets_lock = threading.Lock()
+_thread_budget = threading.local()
+
+
+def _mask_key(api_key):
+    if not api_key:
+        return None
+    return f"...{api_key[-4:]}"
+
+
+def configure(provider, rate, capacity, api_key=None):
+    """Set the limit for a provider host, optionally only for one API key."""
+    with _buckets_lock:
+        _overrides[(provider, api_key)] = (rate, capacity)
+        _buckets.pop((provider, api_key), None)
+
+
+def get_bucket(url, api_key=None):
+    """Return the bucket for the URL's provider and API key, creating it on first use."""
+    provider = urlsplit(url).netloc
+    key = (provider, api_key)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(key)
+            if bucket is None:
+                rate, capacity = _overrides.get(key) or _overrides.get((provider, None)) or \
+                    config.RATE_LIMITS.get(provider, config.RATE_LIMIT_DEFAULT)
+                bucket = TokenBucket(rate, capacity)
+                _buckets[key] = bucket
+    return bucket
+
+
+def set_thread_max_wait(seconds):
+    """Set the default max_wait for requests made on the calling thread (None restores config.RATE_LIMIT_MAX_WAIT).
+
+    Threads that must not block, like Streamlit's script thread, set this to 0 so an over-budget
+    request raises RateLimitExceeded at once instead of sleeping for its slot.
+    """
+    _thread_budget.max_wait = seconds
+
+
+def acquire(bucket, max_wait=None):
+    """Wait for the caller's own slot in the bucket, up to max_wait seconds (see set_thread_max_wait)."""
+    if max_wait is None:
+        max_wait = getattr(_thread_budget, "max_wait", None)
+    if max_wait is None:
+        max_wait = config.RATE_LIMIT_MAX_WAIT
+    wait = bucket.reserve(max_wait)
+    if wait > 0:
+        time.sleep(wait)
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header given in seconds; HTTP dates fall back to jittered backoff."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_rate_limit_stats():
+    """Return throttled/dropped/429 counters per provider and masked API key."""
+    with _buckets_lock:
+        snapshot = {}
+        for (provider, api_key), bucket in _buckets.items():
+            with bucket.lock:
+                entry = dict(bucket.stats)
+                entry["tokens"] = round(bucket.tokens, 2)
+                entry["blocked_for"] = round(max(bucket.blocked_until - time.monotonic(), 0.0), 2)
+            label = provider if api_key is None else f"{provider} ({_mask_key(api_key)})"
+            snapshot[label] = entry
+        return snapshot
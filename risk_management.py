@@ -93,6 +93,77 @@ def calculate_risk_metrics(historical_data, risk_free_rate=0.01):
     }
 
 
+class RiskTracker:
+    """
+    Incremental risk metrics for a live price feed, updated in O(1) per price.
+
+    Matches calculate_risk_metrics on the same price history: Sharpe uses
+    Welford's running mean/variance of excess returns, and drawdown and
+    trailing stop follow the running peak.
+    """
+
+    def __init__(self, risk_free_rate=0.01, trailing_percent=5):
+        self.risk_free_rate = risk_free_rate
+        self.trailing_percent = trailing_percent
+        self.count = 0
+        self.last_price = None
+        self.peak = None
+        self.max_drawdown = 0.0
+        self._returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, price):
+        """Add one price and update every metric."""
+        if self.last_price is not None and self.last_price != 0:
+            excess_return = price / self.last_price - 1 - self.risk_free_rate / 252
+            self._returns += 1
+            delta = excess_return - self._mean
+            self._mean += delta / self._returns
+            self._m2 += delta * (excess_return - self._mean)
+
+        if self.peak is None or price > self.peak:
+            self.peak = price
+        if self.peak:
+            self.max_drawdown = min(self.max_drawdown, (price - self.peak) / self.peak * 100)
+
+        self.last_price = price
+        self.count += 1
+
+    def update_many(self, prices):
+        for price in prices:
+            self.update(price)
+
+    @property
+    def sharpe_ratio(self):
+        if self.count < 2 or self._returns == 0:
+            return 0
+        std_dev = np.sqrt(self._m2 / self._returns)
+        if std_dev == 0:
+            return 0
+        return self._mean / std_dev
+
+    @property
+    def trailing_stop(self):
+        if self.peak is None:
+            return None
+        return self.peak * (1 - self.trailing_percent / 100)
+
+    def snapshot(self):
+        """Return the same dict as calculate_risk_metrics."""
+        if self.count == 0:
+            return {
+                "sharpe_ratio": None,
+                "max_drawdown": None,
+                "trailing_stop": None,
+            }
+        return {
+            "sharpe_ratio": self.sharpe_ratio,
+            "max_drawdown": self.max_drawdown if self.count >= 2 else 0,
+            "trailing_stop": self.trailing_stop,
+        }
+
+
 # Example Usage
 if __name__ == "__main__":
     # Simulated historical price data
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
+import config
+
+
+class SeenSet:
+    """Bounded LRU set of transaction hashes with a time-to-live.
+
+    A hash stays "seen" while it keeps showing up in polls; it is forgotten after
+    ttl seconds without a sighting, or when max_size newer hashes push it out.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = max_size or config.SEEN_TX_MAX_SIZE
+        self.ttl = ttl or config.SEEN_TX_TTL
+        self._entries = OrderedDict()  # hash -> last sighting, least recently seen first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expire(self, now):
+        entries = self._entries
+        while entries and (len(entries) > self.max_size or next(iter(entries.values())) <= now - self.ttl):
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def add(self, tx_hash, now=None):
+        """Mark a hash as seen without counting a lookup (e.g. when warming from stored data)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._entries[tx_hash] = now
+            self._entries.move_to_end(tx_hash)
+            self._expire(now)
+
+    def filter_new(self, transactions, key=lambda tx: tx.get("hash")):
+        """Return only the transactions whose hash has not been seen, recording all of them."""
+        now = time.time()
+        new = []
+        with self._lock:
+            self._expire(now)  # A hash past its TTL must not count as a hit
+            entries = self._entries
+            for tx in transactions:
+                tx_hash = key(tx)
+                if tx_hash is None:
+                    new.append(tx)
+                    continue
+                if tx_hash in entries:
+                    self.hits += 1
+                    entries.move_to_end(tx_hash)
+                else:
+                    self.misses += 1
+                    new.append(tx)
+                entries[tx_hash] = now
+            self._expire(now)
+        return new
+
+    def discard(self, transactions, key=lambda tx: tx.get("hash")):
+        """Forget transactions that filter_new let through but that failed to process, so the next poll retries them."""
+        with self._lock:
+            for tx in transactions:
+                self._entries.pop(key(tx), None)
+
+    def __contains__(self, tx_hash):
+        with self._lock:
+            return tx_hash in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        """Hit/miss counters, hit rate and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+_seen_sets = {}
+_registry_lock = threading.Lock()
+
+
+def get_seen_set(name):
+    """Shared SeenSet for one poller and chain, e.g. "wallet_tracker:bitcoin"."""
+    with _registry_lock:
+        if name not in _seen_sets:
+            _seen_sets[name] = SeenSet()
+        return _seen_sets[name]
+
+
+def get_seen_stats():
+    with _registry_lock:
+        seen_sets = dict(_seen_sets)
+    return {name: seen_set.get_stats() for name, seen_set in seen_sets.items()}
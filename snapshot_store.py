@@ -0,0 +1,120 @@
+import io
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (name, key, version)
+) WITHOUT ROWID;
+"""
+
+_local = threading.local()
+_decoded = {}  # (name, key, version) -> decoded data, so unchanged snapshots are parsed once per process
+_decoded_lock = threading.Lock()
+
+
+def _get_connection():
+    """Return this thread's connection to the snapshot store, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(config.SNAPSHOT_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _is_empty(data):
+    if data is None:
+        return True
+    if isinstance(data, pd.DataFrame):
+        return data.empty
+    return isinstance(data, (dict, list, tuple)) and not data
+
+
+def _default(value):
+    """JSON encoding for DataFrames (dtypes included) and numpy scalars."""
+    if isinstance(value, pd.DataFrame):
+        return {"__frame__": value.to_json(orient="table", index=False, date_unit="ms")}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store {type(value).__name__} in a snapshot")
+
+
+def _object_hook(value):
+    if "__frame__" in value:
+        return pd.read_json(io.StringIO(value["__frame__"]), orient="table")
+    return value
+
+
+def publish(name, key, data):
+    """Store data as the newest version of snapshot (name, key) and return that version.
+
+    Empty data (a failed fetch) is not published, so readers keep the last good snapshot; returns None then.
+    Only the newest config.SNAPSHOT_KEEP_VERSIONS versions are kept.
+    """
+    if _is_empty(data):
+        return None
+    encoded = json.dumps(data, default=_default)
+    conn = _get_connection()
+    with conn:
+        version = conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM snapshots WHERE name = ? AND key = ?",
+                               (name, key)).fetchone()[0]
+        conn.execute("INSERT INTO snapshots (name, key, version, created_at, data) VALUES (?, ?, ?, ?, ?)",
+                     (name, key, version, time.time(), encoded))
+        conn.execute("DELETE FROM snapshots WHERE name = ? AND key = ? AND version <= ?",
+                     (name, key, version - config.SNAPSHOT_KEEP_VERSIONS))
+    return version
+
+
+def get_snapshot(name, key="", version=None, max_age=None):
+    """Return {"version", "created_at", "data"} for the newest (or the given) version of a snapshot.
+
+    Returns None if there is none, or if it is older than max_age seconds.
+    The data is shared with other readers in this process; copy it before modifying it.
+    """
+    conn = _get_connection()
+    if version is None:
+        row = conn.execute("SELECT version, created_at FROM snapshots WHERE name = ? AND key = ? ORDER BY version DESC LIMIT 1",
+                           (name, key)).fetchone()
+    else:
+        row = conn.execute("SELECT version, created_at FROM snapshots WHERE name = ? AND key = ? AND version = ?",
+                           (name, key, version)).fetchone()
+    if row is None or (max_age is not None and time.time() - row[1] > max_age):
+        return None
+
+    version, created_at = row
+    with _decoded_lock:
+        data = _decoded.get((name, key, version))
+    if data is None:
+        encoded = conn.execute("SELECT data FROM snapshots WHERE name = ? AND key = ? AND version = ?",
+                               (name, key, version)).fetchone()
+        if encoded is None:
+            return None  # Pruned by a newer publish between the two queries
+        data = json.loads(encoded[0], object_hook=_object_hook)
+        with _decoded_lock:
+            for cached_key in [k for k in _decoded if k[:2] == (name, key)]:
+                del _decoded[cached_key]
+            _decoded[(name, key, version)] = data
+    return {"version": version, "created_at": created_at, "data": data}
+
+
+def list_snapshots():
+    """Newest version and publish time of every snapshot, e.g. for a health check."""
+    rows = _get_connection().execute(
+        "SELECT name, key, MAX(version), MAX(created_at) FROM snapshots GROUP BY name, key ORDER BY name, key"
+    ).fetchall()
+    return [{"name": name, "key": key, "version": version, "created_at": created_at} for name, key, version, created_at in rows]
@@ -0,0 +1,159 @@
+import heapq
+import threading
+import time
+from collections import deque
+
+import config
+
+
+class RollingWindow:
+    """Exact per-wallet spend over the last `seconds`, with a lazily invalidated max-heap for top-N queries."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.buckets = deque()  # (bucket_start, {wallet: [amount, count]}) shared with the other windows
+        self.starts = set()  # Bucket starts currently in the window
+        self.totals = {}
+        self.counts = {}
+        self._heap = []  # (-total, wallet); entries whose total no longer matches are stale
+
+    def _push(self, wallet):
+        heapq.heappush(self._heap, (-self.totals[wallet], wallet))
+        if len(self._heap) > 2 * len(self.totals) + 1024:
+            # Too many stale entries: rebuild from the live totals
+            self._heap = [(-total, w) for w, total in self.totals.items()]
+            heapq.heapify(self._heap)
+
+    def insert_bucket(self, start, bucket):
+        """Place a bucket in time order; late buckets are rare and land near the end."""
+        index = len(self.buckets)
+        while index and self.buckets[index - 1][0] > start:
+            index -= 1
+        self.buckets.insert(index, (start, bucket))
+        self.starts.add(start)
+
+    def add(self, wallet, amount, count=1):
+        self.totals[wallet] = self.totals.get(wallet, 0.0) + amount
+        self.counts[wallet] = self.counts.get(wallet, 0) + count
+        self._push(wallet)
+
+    def evict(self, now, bucket_seconds):
+        """Drop buckets that ended before the window's start; returns the evicted bucket starts."""
+        evicted = []
+        while self.buckets and self.buckets[0][0] + bucket_seconds <= now - self.seconds:
+            start, bucket = self.buckets.popleft()
+            self.starts.discard(start)
+            for wallet, (amount, count) in bucket.items():
+                self.counts[wallet] -= count
+                if self.counts[wallet] <= 0:
+                    del self.counts[wallet]
+                    del self.totals[wallet]
+                else:
+                    self.totals[wallet] -= amount
+                    self._push(wallet)
+            evicted.append(start)
+        return evicted
+
+    def top(self, n):
+        """Return [(wallet, total)] for the n biggest spenders, largest first."""
+        result, valid, seen = [], [], set()
+        while self._heap and len(result) < n:
+            negative_total, wallet = heapq.heappop(self._heap)
+            if wallet in seen or self.totals.get(wallet) != -negative_total:
+                continue  # Stale entry, discard it for good
+            seen.add(wallet)
+            valid.append((negative_total, wallet))
+            result.append((wallet, -negative_total))
+        for entry in valid:
+            heapq.heappush(self._heap, entry)
+        return result
+
+
+class SpenderLeaderboard:
+    """Streaming per-chain spend leaderboards over rolling windows (1h/24h/7d by default).
+
+    Transactions are grouped into time buckets of bucket_seconds; each window keeps
+    exact running totals for the buckets it covers and subtracts a bucket when it
+    slides out, so queries never rescan transactions.
+    """
+
+    def __init__(self, windows=None, bucket_seconds=None):
+        self.windows = dict(windows or config.LEADERBOARD_WINDOWS)
+        self.bucket_seconds = bucket_seconds or config.LEADERBOARD_BUCKET_SECONDS
+        self.horizon = max(self.windows.values())
+        self._chains = {}
+        self._lock = threading.Lock()
+
+    def _chain(self, chain):
+        state = self._chains.get(chain)
+        if state is None:
+            state = {"buckets": {}, "windows": {name: RollingWindow(seconds) for name, seconds in self.windows.items()}}
+            self._chains[chain] = state
+        return state
+
+    def add(self, chain, wallet, amount, timestamp=None, now=None):
+        """Count one spend; transactions older than the longest window are ignored."""
+        now = time.time() if now is None else now
+        timestamp = now if timestamp is None else timestamp
+        if not wallet or amount <= 0 or timestamp <= now - self.horizon:
+            return False
+
+        with self._lock:
+            state = self._chain(chain)
+            start = int(timestamp // self.bucket_seconds * self.bucket_seconds)
+            bucket = state["buckets"].get(start)
+            if bucket is None:
+                bucket = state["buckets"][start] = {}
+                for window in state["windows"].values():
+                    if start + self.bucket_seconds > now - window.seconds:
+                        window.insert_bucket(start, bucket)
+
+            entry = bucket.setdefault(wallet, [0.0, 0])
+            entry[0] += amount
+            entry[1] += 1
+            for window in state["windows"].values():
+                if start in window.starts:
+                    window.add(wallet, amount)
+        return True
+
+    def add_transactions(self, transactions, now=None):
+        """Feed normalized Transaction records; only native-coin spends are ranked."""
+        added = 0
+        for tx in transactions:
+            if tx.token is None:
+                added += self.add(tx.chain, tx.from_address, tx.value, tx.timestamp, now)
+        return added
+
+    def advance(self, now=None):
+        """Slide every window forward to `now`, subtracting the buckets that fell out."""
+        now = time.time() if now is None else now
+        with self._lock:
+            for state in self._chains.values():
+                for window in state["windows"].values():
+                    expired = window.evict(now, self.bucket_seconds)
+                    if window.seconds == self.horizon:
+                        for start in expired:
+                            state["buckets"].pop(start, None)  # No window covers it any more
+
+    def top(self, window="24h", n=100, chain=None, prices=None, now=None):
+        """Top-n spenders for a window on one chain, or across all chains when chain is None.
+
+        Across chains, amounts are multiplied by prices[chain] (e.g. USD per coin) when given.
+        Returns [(chain, wallet, amount)], largest first.
+        """
+        self.advance(now)
+        with self._lock:
+            chains = [chain] if chain is not None else list(self._chains)
+            ranked = []
+            for name in chains:
+                state = self._chains.get(name)
+                if state is None:
+                    continue
+                price = prices.get(name, 1.0) if prices else 1.0
+                ranked += [(name, wallet, total * price) for wallet, total in state["windows"][window].top(n)]
+        return heapq.nlargest(n, ranked, key=lambda entry: entry[2])
+
+    def spend(self, chain, wallet, window="24h"):
+        with self._lock:
+            state = self._chains.get(chain)
+            return state["windows"][window].totals.get(wallet, 0.0) if state else 0.0
@@ -1,7 +1,9 @@
-import requests
+import http_client
+import transaction_store
+from transaction_normalizer import iter_transactions, to_frame
 import datetime
 import pandas as pd
-from notifications import send_email_alert, send_telegram_alert, send_discord_alert
+from notifications import send_alert
 
 # Example API URLs (You need actual blockchain API keys)
 SOLANA_API_URL = "https://api.solana.com/getTransactions"
@@ -22,17 +24,22 @@ def fetch_transactions(wallet_address, blockchain):
     else:
         return []
 
-    response = requests.get(url).json()
-    return response.get("transactions", [])
+    response = http_client.get(url).json()
+    transactions = response.get("transactions", [])
+    transaction_store.save_transactions(blockchain, transactions)
+    return transactions
 
-def analyze_spending(wallet_address, blockchain):
-    """Analyze spending patterns & detect demo accounts."""
-    transactions = fetch_transactions(wallet_address, blockchain)
+def analyze_spending(wallet_address, blockchain, offline=False):
+    """Analyze spending patterns & detect demo accounts; offline=True reads the local transaction store."""
+    if offline:
+        transactions = transaction_store.load_transactions(blockchain, wallet_address)[::-1]  # Oldest first, like the API
+    else:
+        transactions = fetch_transactions(wallet_address, blockchain)
     
     if not transactions:
         return "No transaction data available."
 
-    df = pd.DataFrame(transactions)
+    df = to_frame(iter_transactions(blockchain, transactions)).rename(columns={"value": "amount"})
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit='s')
     
     # Track first-time purchase
@@ -48,14 +55,12 @@ def analyze_spending(wallet_address, blockchain):
     highest_spender = daily_transactions.loc[daily_transactions["amount"].idxmax()] if not daily_transactions.empty else None
 
     # Remaining balance check
-    remaining_balance = df["balance"].iloc[-1] if not df.empty else 0
+    remaining_balance = transactions[-1].get("balance", 0)  # Provider field, not part of the normalized record
 
     # Alerts
     if demo_account:
         message = f"⚠️ **Demo Account Detected!**\n🔗 Wallet: {wallet_address}\n📊 Too many small transactions!"
-        send_email_alert("Demo Account Alert", message)
-        send_telegram_alert(message)
-        send_discord_alert(message)
+        send_alert("Demo Account Alert", message)
 
     return {
         "first_purchase": first_purchase.to_dict() if first_purchase is not None else "No purchases",
@@ -0,0 +1,24 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chain_sketches
+import config
+import seen_filter
+import transaction_store
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Point the transaction and sketch stores at fresh files and forget every in-process cache."""
+    monkeypatch.setattr(config, "TX_STORE_PATH", str(tmp_path / "transactions.db"))
+    monkeypatch.setattr(config, "SKETCH_STORE_PATH", str(tmp_path / "chain_sketches.db"))
+    monkeypatch.setattr(transaction_store, "_local", threading.local())
+    monkeypatch.setattr(chain_sketches, "_local", threading.local())
+    monkeypatch.setattr(chain_sketches, "_pending", {})
+    monkeypatch.setattr(seen_filter, "_seen_sets", {})
+    return tmp_path
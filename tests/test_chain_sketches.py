@@ -0,0 +1,65 @@
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+import chain_sketches
+import config
+from chain_sketches import ChainSketch, CountMinSketch, HyperLogLog
+from transaction_normalizer import Transaction
+
+
+def test_hyperloglog_merge_matches_a_single_sketch_of_the_union():
+    left, right, union = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    left.add_many(range(0, 6000))
+    right.add_many(range(4000, 10000))
+    union.add_many(range(0, 10000))
+
+    merged = HyperLogLog.from_dict(left.to_dict()).merge(HyperLogLog.from_dict(right.to_dict()))
+    assert np.array_equal(merged.registers, union.registers)
+    assert merged.count() == pytest.approx(10000, rel=0.05)
+
+
+def test_count_min_merge_round_trip_never_undercounts():
+    left, right = CountMinSketch(256, 4), CountMinSketch(256, 4)
+    left.add_many(["a", "b"], [5, 1])
+    right.add_many(["a", "c"], [2, 7])
+
+    merged = CountMinSketch.from_dict(left.to_dict()).merge(CountMinSketch.from_dict(right.to_dict()))
+    assert np.array_equal(merged.table, left.table + right.table)
+    estimates = merged.estimate_many(["a", "b", "c"])
+    assert all(estimates >= [7, 1, 7])
+
+
+def test_chain_sketch_survives_the_store(stores):
+    bucket_start = int(time.time()) // config.SKETCH_BUCKET_SECONDS * config.SKETCH_BUCKET_SECONDS
+    batch = [
+        Transaction("ethereum", "0x1", "0xalice", "0xbob", 2 * 10 ** 18, 18, timestamp=bucket_start + 1),
+        Transaction("ethereum", "0x2", "0xalice", "0xcarol", 10 ** 18, 18, timestamp=bucket_start + 2),
+        Transaction("ethereum", "0x3", "0xbob", "0xcarol", 50, 0, token="USDT", timestamp=bucket_start + 3),
+    ]
+    chain_sketches.record_transactions(batch[:2])
+    chain_sketches.flush()
+    chain_sketches.record_transactions(batch[2:])  # Merged into the stored bucket on the next flush
+    chain_sketches.flush()
+
+    stored = chain_sketches._get_connection().execute("SELECT state FROM chain_sketches").fetchall()
+    assert len(stored) == 1
+    sketch = ChainSketch.from_json(stored[0][0])
+    assert (sketch.transactions, sketch.volume) == (3, pytest.approx(3.0))
+    assert sketch.addresses.count() == 3
+    assert sketch.top_addresses.top(1)[0] == ("0xalice", pytest.approx(3.0))
+    assert dict(sketch.top_tokens.top()) == {"native": 2, "USDT": 1}
+
+
+def test_reads_without_pending_sketches_take_no_write_lock(stores):
+    conn = chain_sketches._get_connection()
+    conn.execute("PRAGMA busy_timeout = 100")
+    writer = sqlite3.connect(config.SKETCH_STORE_PATH)
+    writer.execute("BEGIN IMMEDIATE")  # Another process mid-flush
+    try:
+        assert chain_sketches.get_chain_summary("ethereum")["total_transactions"] == 0
+    finally:
+        writer.rollback()
+        writer.close()
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+import highest_spenders
+import transaction_store
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+def etherscan_batch(now):
+    return [
+        {"hash": "0x1", "from": "0xalice", "to": "0xbob", "value": str(2 * 10 ** 18), "timeStamp": str(now - 60), "blockNumber": "1"},
+        {"hash": "0x2", "from": "0xalice", "to": "0xcarol", "value": str(10 ** 18), "timeStamp": str(now - 30), "blockNumber": "2"},
+        {"hash": "0x3", "from": "0xbob", "to": "0xcarol", "value": str(5 * 10 ** 17), "timeStamp": str(now - 10), "blockNumber": "3"},
+    ]
+
+
+@pytest.fixture
+def cold_leaderboard(stores, monkeypatch):
+    monkeypatch.setattr(highest_spenders, "_leaderboard", None)
+    batch = etherscan_batch(int(time.time()))
+    monkeypatch.setattr(highest_spenders.http_client, "get", lambda url, **kwargs: FakeResponse(batch))
+    return batch
+
+
+def totals():
+    return {wallet: amount for _, wallet, amount in highest_spenders.get_leaderboard().top("1h", 10, "ethereum")}
+
+
+def test_cold_start_counts_the_first_poll_once(cold_leaderboard):
+    highest_spenders.fetch_transactions("ethereum")
+    highest_spenders.fetch_transactions("ethereum")  # Same snapshot again
+
+    assert totals() == pytest.approx({"0xalice": 3.0, "0xbob": 0.5})
+
+
+def test_cold_start_skips_a_batch_already_in_the_store(cold_leaderboard):
+    transaction_store.save_transactions("ethereum", cold_leaderboard)  # Stored by another poller
+
+    assert highest_spenders.fetch_transactions("ethereum") == []
+    assert totals() == pytest.approx({"0xalice": 3.0, "0xbob": 0.5})
@@ -0,0 +1,56 @@
+import seen_filter
+from seen_filter import SeenSet
+
+
+def tx(tx_hash):
+    return {"hash": tx_hash}
+
+
+def test_repeats_are_filtered_and_counted():
+    seen_set = SeenSet(max_size=10, ttl=60)
+
+    assert seen_set.filter_new([tx("a"), tx("b")]) == [tx("a"), tx("b")]
+    assert seen_set.filter_new([tx("b"), tx("c")]) == [tx("c")]
+
+    stats = seen_set.get_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 3, 3)
+    assert stats["hit_rate"] == 0.25
+
+
+def test_hashes_expire_after_ttl_without_a_sighting(monkeypatch):
+    seen_set = SeenSet(max_size=10, ttl=60)
+    monkeypatch.setattr(seen_filter.time, "time", lambda: 1000.0)
+    seen_set.filter_new([tx("a"), tx("b")])
+    monkeypatch.setattr(seen_filter.time, "time", lambda: 1050.0)
+    seen_set.filter_new([tx("b")])  # Sighting refreshes b
+
+    monkeypatch.setattr(seen_filter.time, "time", lambda: 1070.0)
+    assert seen_set.filter_new([tx("a"), tx("b")]) == [tx("a")]
+    assert seen_set.evictions == 1
+
+
+def test_size_bound_evicts_least_recently_seen():
+    seen_set = SeenSet(max_size=3, ttl=60)
+    seen_set.filter_new([tx("a"), tx("b"), tx("c")])
+    seen_set.filter_new([tx("a")])  # a is now the most recent
+    seen_set.filter_new([tx("d")])
+
+    assert len(seen_set) == 3
+    assert "b" not in seen_set
+    assert all(h in seen_set for h in ("a", "c", "d"))
+
+
+def test_discard_lets_the_next_poll_retry():
+    seen_set = SeenSet(max_size=10, ttl=60)
+    batch = seen_set.filter_new([tx("a"), tx("b")])
+    seen_set.discard(batch[:1])
+
+    assert seen_set.filter_new([tx("a"), tx("b")]) == [tx("a")]
+
+
+def test_add_marks_seen_without_counting_a_lookup():
+    seen_set = SeenSet(max_size=10, ttl=60)
+    seen_set.add("a")
+
+    assert seen_set.filter_new([tx("a")]) == []
+    assert (seen_set.hits, seen_set.misses) == (1, 0)
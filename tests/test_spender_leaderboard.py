@@ -0,0 +1,62 @@
+import pytest
+
+from spender_leaderboard import RollingWindow, SpenderLeaderboard
+
+NOW = 1000
+
+
+@pytest.fixture
+def leaderboard():
+    return SpenderLeaderboard(windows={"short": 60, "long": 300}, bucket_seconds=10)
+
+
+def ranking(leaderboard, window, now):
+    return [(wallet, amount) for _, wallet, amount in leaderboard.top(window, 10, "ethereum", now=now)]
+
+
+def test_buckets_slide_out_of_each_window(leaderboard):
+    leaderboard.add("ethereum", "a", 5, timestamp=955, now=NOW)
+    leaderboard.add("ethereum", "a", 1, timestamp=995, now=NOW)
+    leaderboard.add("ethereum", "b", 3, timestamp=995, now=NOW)
+
+    assert ranking(leaderboard, "short", NOW) == [("a", 6), ("b", 3)]
+    # Bucket 950 ends at 960, which is before the short window's start
+    assert ranking(leaderboard, "short", 1021) == [("b", 3), ("a", 1)]
+    assert ranking(leaderboard, "long", 1021) == [("a", 6), ("b", 3)]
+
+    assert ranking(leaderboard, "long", 1300) == []
+    assert leaderboard._chains["ethereum"]["buckets"] == {}
+
+
+def test_late_bucket_is_placed_in_time_order(leaderboard):
+    leaderboard.add("ethereum", "a", 5, timestamp=995, now=NOW)
+    leaderboard.add("ethereum", "b", 3, timestamp=950, now=NOW)  # Arrives after a newer bucket
+
+    short = leaderboard._chains["ethereum"]["windows"]["short"]
+    assert [start for start, _ in short.buckets] == [950, 990]
+    assert ranking(leaderboard, "short", 1021) == [("a", 5)]
+
+
+def test_spends_outside_the_horizon_are_ignored(leaderboard):
+    assert not leaderboard.add("ethereum", "a", 5, timestamp=NOW - 300, now=NOW)
+    assert not leaderboard.add("ethereum", "a", 0, timestamp=NOW, now=NOW)
+    assert leaderboard.add("ethereum", "a", 5, timestamp=NOW - 299, now=NOW)
+
+
+def test_chains_are_ranked_together_with_prices(leaderboard):
+    leaderboard.add("ethereum", "a", 2, timestamp=995, now=NOW)
+    leaderboard.add("bitcoin", "b", 1, timestamp=995, now=NOW)
+
+    top = leaderboard.top("short", 10, prices={"ethereum": 2000, "bitcoin": 60000}, now=NOW)
+    assert top == [("bitcoin", "b", 60000), ("ethereum", "a", 4000)]
+
+
+def test_stale_heap_entries_are_rebuilt_away():
+    window = RollingWindow(60)
+    for _ in range(5000):
+        window.add("a", 1)
+    window.add("b", 2)
+
+    assert len(window._heap) <= 2 * len(window.totals) + 1024 + 1
+    assert window.top(2) == [("a", 5000), ("b", 2)]
+    assert window.top(2) == [("a", 5000), ("b", 2)]  # Valid entries survive a query
@@ -0,0 +1,213 @@
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import websocket
+
+import config
+
+try:
+    import orjson  # Optional, several times faster than json for small messages
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+BINANCE_COMBINED_STREAM_URL = "wss://stream.binance.com:9443/stream?streams="
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+# Compact tick record: 27 bytes per trade instead of a parsed dict
+TICK_DTYPE = np.dtype([
+    ("timestamp", "i8"),  # Trade time in ms
+    ("symbol", "u2"),  # Index into TickIngestor.symbols
+    ("price", "f8"),
+    ("qty", "f8"),
+    ("side", "i1"),  # Aggressor side: SIDE_BUY or SIDE_SELL
+])
+
+
+class TickRingBuffer:
+    """Preallocated ring buffer of TICK_DTYPE records; the oldest ticks are dropped when it is full."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=TICK_DTYPE)
+        self.write_index = 0
+        self.read_index = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.write_index - self.read_index
+
+    def append(self, timestamp, symbol, price, qty, side):
+        with self.lock:
+            if self.write_index - self.read_index >= self.capacity:
+                self.read_index += 1
+                self.dropped += 1
+            self.buffer[self.write_index % self.capacity] = (timestamp, symbol, price, qty, side)
+            self.write_index += 1
+
+    def drain(self, max_items=None):
+        """Remove and return up to max_items ticks, oldest first, as a contiguous array copy."""
+        with self.lock:
+            count = self.write_index - self.read_index
+            if max_items is not None:
+                count = min(count, max_items)
+            start = self.read_index % self.capacity
+            if start + count <= self.capacity:
+                batch = self.buffer[start:start + count].copy()
+            else:
+                batch = np.concatenate((self.buffer[start:], self.buffer[:count - (self.capacity - start)]))
+            self.read_index += count
+            return batch
+
+
+class TickIngestor:
+    """Combined-stream Binance trade ingestion with batched hand-off to consumers.
+
+    Consumers are callables taking (batch, ingestor), where batch is a TICK_DTYPE
+    array; map batch["symbol"] back to names with ingestor.symbols.
+    """
+
+    def __init__(self, symbols, capacity=None, batch_size=None, flush_interval=None):
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.buffer = TickRingBuffer(capacity or config.TICK_BUFFER_CAPACITY)
+        self.batch_size = batch_size or config.TICK_BATCH_SIZE
+        self.flush_interval = flush_interval or config.TICK_FLUSH_INTERVAL
+        self.consumers = []
+        self.ws = None
+        self._running = threading.Event()
+        self._dispatcher = None
+        self._started_at = None
+        self.stats = {
+            "messages": 0,
+            "parse_errors": 0,
+            "batches": 0,
+            "consumer_errors": 0,
+            "total_lag_ms": 0,
+            "max_lag_ms": 0,
+        }
+
+    @property
+    def stream_url(self):
+        return BINANCE_COMBINED_STREAM_URL + "/".join(f"{symbol.lower()}@trade" for symbol in self.symbols)
+
+    def add_consumer(self, consumer):
+        self.consumers.append(consumer)
+
+    def handle_message(self, message):
+        """Parse one trade message straight into the ring buffer."""
+        try:
+            payload = _loads(message)
+            trade = payload.get("data", payload)  # Combined streams wrap each event
+            symbol_id = self.symbol_ids[trade["s"]]
+            timestamp = trade["T"]
+            side = SIDE_SELL if trade["m"] else SIDE_BUY  # Buyer is maker -> seller was the aggressor
+            self.buffer.append(timestamp, symbol_id, float(trade["p"]), float(trade["q"]), side)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.stats["parse_errors"] += 1
+            return
+
+        lag = int(time.time() * 1000) - timestamp
+        self.stats["messages"] += 1
+        self.stats["total_lag_ms"] += lag
+        if lag > self.stats["max_lag_ms"]:
+            self.stats["max_lag_ms"] = lag
+
+    def on_message(self, ws, message):
+        self.handle_message(message)
+
+    def dispatch_pending(self):
+        """Hand every buffered tick to the consumers in batches of at most batch_size."""
+        while len(self.buffer):
+            batch = self.buffer.drain(self.batch_size)
+            self.stats["batches"] += 1
+            for consumer in self.consumers:
+                try:
+                    consumer(batch, self)
+                except Exception as e:
+                    self.stats["consumer_errors"] += 1
+                    print(f"⚠️ Tick consumer failed: {e}")
+
+    def _dispatch_loop(self):
+        while self._running.is_set():
+            time.sleep(self.flush_interval)
+            self.dispatch_pending()
+        self.dispatch_pending()
+
+    def start(self, on_open=None, on_error=None, on_close=None):
+        """Start the dispatcher thread and run the websocket until stop() is called."""
+        self._running.set()
+        self._started_at = time.monotonic()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="tick-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+        self.ws = websocket.WebSocketApp(self.stream_url,
+                                         on_message=self.on_message,
+                                         on_open=on_open,
+                                         on_error=on_error,
+                                         on_close=on_close)
+        try:
+            self.ws.run_forever()
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._running.clear()
+        if self.ws is not None:
+            self.ws.close()
+        if self._dispatcher is not None and self._dispatcher is not threading.current_thread():
+            self._dispatcher.join()
+
+    def get_stats(self):
+        """Throughput, lag and buffer counters."""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0
+        messages = self.stats["messages"]
+        return dict(
+            self.stats,
+            ticks_per_second=messages / elapsed if elapsed else 0.0,
+            avg_lag_ms=self.stats["total_lag_ms"] / messages if messages else 0.0,
+            buffered=len(self.buffer),
+            dropped=self.buffer.dropped,
+        )
+
+
+class BarBuilder:
+    """Tick consumer that aggregates trades into OHLCV bars per symbol."""
+
+    def __init__(self, interval_ms=60_000, max_bars=1000):
+        self.interval_ms = interval_ms
+        self.current = {}
+        self.bars = {}
+        self.max_bars = max_bars
+
+    def _merge(self, symbol, start, open_, high, low, close, volume):
+        bar = self.current.get(symbol)
+        if bar is not None and bar["start"] == start:
+            bar["high"] = max(bar["high"], high)
+            bar["low"] = min(bar["low"], low)
+            bar["close"] = close
+            bar["volume"] += volume
+            return
+        if bar is not None:
+            self.bars.setdefault(symbol, deque(maxlen=self.max_bars)).append(bar)
+        self.current[symbol] = {"start": start, "open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+    def __call__(self, batch, ingestor):
+        for symbol_id in np.unique(batch["symbol"]):
+            ticks = batch[batch["symbol"] == symbol_id]
+            symbol = ingestor.symbols[symbol_id]
+            bar_starts = ticks["timestamp"] // self.interval_ms * self.interval_ms
+            splits = np.flatnonzero(bar_starts[1:] != bar_starts[:-1]) + 1
+            for start, end in zip(np.r_[0, splits], np.r_[splits, len(ticks)]):
+                prices = ticks["price"][start:end]
+                self._merge(symbol, int(bar_starts[start]), float(prices[0]), float(prices.max()), float(prices.min()),
+                            float(prices[-1]), float(ticks["qty"][start:end].sum()))
+
+    def completed_bars(self, symbol):
+        return list(self.bars.get(symbol.upper(), []))
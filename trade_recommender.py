@@ -5,13 +5,13 @@ from notifications import notify_wallet_event
 BUY_THRESHOLD_BTC = 0.1  # Example threshold for BTC
 BUY_THRESHOLD_SOL = 5  # Example threshold for SOL
 
-import requests
+import http_client
 
 def get_market_trend(coin):
     """Fetch real-time market trends for a given coin."""
     url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin}&vs_currencies=usd&include_24hr_change=true"
     try:
-        response = requests.get(url).json()
+        response = http_client.get(url).json()
         price = response[coin]["usd"]
         change_24h = response[coin]["usd_24h_change"]
         return price, change_24h
@@ -0,0 +1,165 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+import config
+import http_client
+import transaction_store
+
+load_dotenv()
+
+# Chain -> (Etherscan-compatible API, API key)
+EVM_HISTORY_APIS = {
+    "ethereum": ("https://api.etherscan.io/api", os.getenv("ETHERSCAN_API_KEY")),
+    "binance smart chain": ("https://api.bscscan.com/api", os.getenv("BSCSCAN_API_KEY")),
+}
+BITCOIN_RAWADDR_URL = "https://blockchain.info/rawaddr/{address}"
+
+ETHERSCAN_RESULT_WINDOW = 10000  # Etherscan only serves page * offset <= 10000 per query
+SUPPORTED_CHAINS = tuple(EVM_HISTORY_APIS) + ("bitcoin",)
+
+
+def _ordered_fetch(pool, fetch, args_iter, max_concurrency):
+    """Run fetch(*args) with at most max_concurrency calls in flight, yielding (args, result) in submission order."""
+    args_iter = iter(args_iter)
+    pending = deque((args, pool.submit(fetch, *args)) for args in itertools.islice(args_iter, max_concurrency))
+    try:
+        while pending:
+            args, future = pending.popleft()
+            result = future.result()
+            next_args = next(args_iter, None)
+            if next_args is not None:
+                pending.append((next_args, pool.submit(fetch, *next_args)))
+            yield args, result
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def _evm_page(chain, address, startblock, page, page_size):
+    url, api_key = EVM_HISTORY_APIS[chain]
+    params = {
+        "module": "account",
+        "action": "txlist",
+        "address": address,
+        "startblock": startblock,
+        "endblock": 99999999,
+        "page": page,
+        "offset": page_size,
+        "sort": "asc",  # Oldest first, so offsets stay stable while new transactions arrive
+        "apikey": api_key,
+    }
+    data = http_client.get(url, params=params).json()
+    result = data.get("result")
+    if not isinstance(result, list):
+        raise RuntimeError(f"{chain} history request failed: {data.get('message')} {result}")
+    return result
+
+
+def _iter_evm_pages(pool, chain, address, checkpoint, max_concurrency, page_size):
+    """Oldest-first pages, walked in windows of startblock so Etherscan's 10000-result cap never truncates history."""
+    startblock = checkpoint.get("startblock", 0)
+    boundary_hashes = set(checkpoint.get("boundary_hashes", []))  # Already yielded txs in block `startblock`
+    pages_per_window = max(1, ETHERSCAN_RESULT_WINDOW // page_size)
+
+    while True:
+        window_start = startblock
+        pages = ((chain, address, window_start, page, page_size) for page in range(1, pages_per_window + 1))
+        for _, transactions in _ordered_fetch(pool, _evm_page, pages, max_concurrency):
+            new = []
+            for tx in transactions:
+                block = int(tx.get("blockNumber", 0))
+                if block == startblock and tx.get("hash") in boundary_hashes:
+                    continue  # Overlap with the previous window or crawl
+                if block > startblock:
+                    startblock, boundary_hashes = block, set()
+                boundary_hashes.add(tx.get("hash"))
+                new.append(tx)
+            yield new, {"startblock": startblock, "boundary_hashes": sorted(boundary_hashes)}
+            if len(transactions) < page_size:
+                return  # Reached the newest transaction
+
+        # The window filled up; the next one starts at the newest block seen so far
+        if startblock == window_start:
+            print(f"⚠️ {address} has more than {ETHERSCAN_RESULT_WINDOW} transactions in block {startblock}, skipping the rest of it")
+            startblock, boundary_hashes = startblock + 1, set()
+
+
+def _rawaddr_page(address, offset, limit):
+    params = {"offset": offset, "limit": limit}
+    return http_client.get(BITCOIN_RAWADDR_URL.format(address=address), params=params).json()
+
+
+def _iter_bitcoin_pages(pool, address, checkpoint, max_concurrency, page_size):
+    """Newest-first rawaddr pages; offsets saved in the checkpoint are shifted by transactions that arrived since."""
+    first = _rawaddr_page(address, 0, page_size)
+    n_tx = first.get("n_tx", 0)
+
+    # Transactions [done_start, done_end) in today's newest-first order are already stored
+    shift = n_tx - checkpoint.get("n_tx", n_tx)
+    done_start, done_end = shift, shift + checkpoint.get("fetched", 0)
+    ranges = [(0, n_tx)] if done_end <= done_start else [(0, done_start), (done_end, n_tx)]
+
+    seen = set()
+    prefix = 0
+
+    def take(page, offset, limit):
+        nonlocal prefix
+        new = []
+        for tx in page.get("txs", [])[:limit]:
+            if tx.get("hash") not in seen:
+                seen.add(tx.get("hash"))
+                new.append(tx)
+        prefix = offset + limit
+        if done_start < done_end and prefix >= done_start:
+            prefix = max(prefix, done_end)
+        return new, {"n_tx": n_tx, "fetched": min(prefix, n_tx)}
+
+    offsets = [(offset, min(page_size, end - offset)) for start, end in ranges if end > start
+               for offset in range(start, end, page_size)]
+    if offsets and offsets[0][0] == 0:
+        yield take(first, *offsets.pop(0))
+
+    pages = ((address, offset, limit) for offset, limit in offsets)
+    for (_, offset, limit), page in _ordered_fetch(pool, _rawaddr_page, pages, max_concurrency):
+        yield take(page, offset, limit)
+    if not offsets:
+        yield [], {"n_tx": n_tx, "fetched": n_tx}
+
+
+def iter_transaction_pages(wallet_address, blockchain, resume=True, max_concurrency=None):
+    """Stream a wallet's full transaction history as pages of raw explorer transactions.
+
+    Up to max_concurrency pages are in flight at once; http_client's rate limiter keeps them
+    inside each explorer's budget. Pages are yielded in order (oldest first on EVM chains,
+    newest first on Bitcoin), stored in transaction_store, and a checkpoint is saved once the
+    caller has consumed each page, so an interrupted crawl resumes where it stopped and a
+    finished one only fetches transactions that arrived since.
+    """
+    chain = transaction_store.chain_key(blockchain)
+    if chain not in SUPPORTED_CHAINS:
+        raise ValueError(f"Paginated history is not supported for {blockchain}")
+    max_concurrency = max_concurrency or config.HISTORY_MAX_CONCURRENCY
+    checkpoint = (transaction_store.get_checkpoint(chain, wallet_address) if resume else None) or {}
+
+    pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="history")
+    try:
+        if chain == "bitcoin":
+            pages = _iter_bitcoin_pages(pool, wallet_address, checkpoint, max_concurrency, config.HISTORY_BITCOIN_PAGE_SIZE)
+        else:
+            pages = _iter_evm_pages(pool, chain, wallet_address, checkpoint, max_concurrency, config.HISTORY_EVM_PAGE_SIZE)
+        for transactions, state in pages:
+            transaction_store.save_transactions(chain, transactions)
+            if transactions:
+                yield transactions
+            transaction_store.save_checkpoint(chain, wallet_address, state)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_full_history(wallet_address, blockchain, resume=False, max_concurrency=None):
+    """Return a wallet's whole transaction history as one list (resume=True returns only what is new)."""
+    return [tx for page in iter_transaction_pages(wallet_address, blockchain, resume, max_concurrency) for tx in page]
@@ -0,0 +1,138 @@
+import hashlib
+import json
+
+import pandas as pd
+
+# Chain names used across the fetchers -> one canonical key
+CHAIN_ALIASES = {
+    "bsc": "binance smart chain",
+    "binance": "binance smart chain",
+    "binancecoin": "binance smart chain",
+}
+
+# Decimals of each chain's native coin (EVM chains default to 18)
+NATIVE_DECIMALS = {
+    "bitcoin": 8,
+    "solana": 9,
+}
+
+# Keys explorers wrap their transaction lists in
+PAYLOAD_KEYS = ("txs", "result", "transactions", "data")
+
+
+def chain_key(chain):
+    chain = chain.lower()
+    return CHAIN_ALIASES.get(chain, chain)
+
+
+class Transaction:
+    """One transfer in a chain-independent shape; amount is an integer in the token's base units."""
+
+    __slots__ = ("chain", "hash", "from_address", "to_address", "amount", "decimals", "token", "timestamp", "block")
+
+    def __init__(self, chain, hash, from_address, to_address, amount, decimals, token=None, timestamp=None, block=None):
+        self.chain = chain
+        self.hash = hash
+        self.from_address = from_address
+        self.to_address = to_address
+        self.amount = amount
+        self.decimals = decimals
+        self.token = token  # None for the chain's native coin
+        self.timestamp = timestamp
+        self.block = block
+
+    @property
+    def value(self):
+        """Amount in whole coins or tokens."""
+        return self.amount / 10 ** self.decimals
+
+    def __repr__(self):
+        return f"Transaction({self.chain}, {self.hash}, {self.from_address} -> {self.to_address}, {self.value} {self.token or 'native'})"
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def transaction_hash(chain, tx):
+    """The provider's transaction hash or signature, falling back to a digest of the payload."""
+    tx_hash = tx.get("hash") or tx.get("txHash") or tx.get("signature")
+    if not tx_hash:
+        # Some providers omit hashes; a digest of the payload still dedups repeated fetches
+        tx_hash = hashlib.sha1(json.dumps(tx, sort_keys=True, default=str).encode()).hexdigest()
+    return tx_hash
+
+
+def normalize(chain, tx):
+    """Turn one raw explorer transaction (Etherscan, blockchain.info, Solscan/solana.fm) into a Transaction."""
+    chain = chain_key(chain)
+    decimals = NATIVE_DECIMALS.get(chain, 18)
+    token = None
+
+    if chain == "bitcoin":
+        inputs = tx.get("inputs", [])
+        outputs = tx.get("out", [])
+        sender = next((i["prev_out"]["addr"] for i in inputs if i.get("prev_out", {}).get("addr")), None)
+        receiver = next((out["addr"] for out in outputs if out.get("addr")), None)
+        amount = sum(out.get("value", 0) for out in outputs)
+        timestamp, block = tx.get("time"), tx.get("block_height")
+    elif chain == "solana":
+        meta = tx.get("transaction", {}).get("meta", {})
+        if "preBalances" in meta:
+            amount = meta["preBalances"][0] - meta["postBalances"][0]  # Lamports
+        else:
+            amount = _int_or_none(tx.get("lamport"))
+        signer = tx.get("signer")
+        sender = signer[0] if isinstance(signer, list) and signer else tx.get("from")
+        receiver = tx.get("to")
+        timestamp, block = tx.get("blockTime"), tx.get("slot")
+    else:
+        sender, receiver = tx.get("from"), tx.get("to")
+        if "tokenSymbol" in tx:
+            token = tx["tokenSymbol"]
+            decimals = _int_or_none(tx.get("tokenDecimal")) or 0
+        amount = _int_or_none(tx.get("value"))
+        timestamp, block = tx.get("timeStamp"), tx.get("blockNumber")
+
+    if amount is None:
+        # Providers that report whole-coin amounts
+        amount = int(round(float(tx.get("amount") or 0) * 10 ** decimals))
+    if timestamp is None:
+        timestamp = tx.get("timestamp")
+    return Transaction(chain, transaction_hash(chain, tx), sender, receiver, amount, decimals, token, _int_or_none(timestamp), _int_or_none(block))
+
+
+def raw_transactions(payload):
+    """The list of raw transactions inside an explorer response (or the payload itself if it is a list)."""
+    if isinstance(payload, dict):
+        for key in PAYLOAD_KEYS:
+            if isinstance(payload.get(key), list):
+                return payload[key]
+        return []
+    return payload or []
+
+
+def iter_transactions(chain, payload):
+    """Lazily normalize a response, a list of raw transactions or a stream of pages of them."""
+    for item in raw_transactions(payload):
+        if isinstance(item, list):  # A page from transaction_history
+            yield from iter_transactions(chain, item)
+        elif isinstance(item, dict):
+            yield normalize(chain, item)
+
+
+def to_frame(transactions):
+    """Columnar DataFrame (one column per field, value in whole coins) from Transaction records."""
+    columns = {name: [] for name in ("hash", "from_address", "to_address", "value", "token", "timestamp", "block")}
+    for tx in transactions:
+        columns["hash"].append(tx.hash)
+        columns["from_address"].append(tx.from_address)
+        columns["to_address"].append(tx.to_address)
+        columns["value"].append(tx.value)
+        columns["token"].append(tx.token)
+        columns["timestamp"].append(tx.timestamp)
+        columns["block"].append(tx.block)
+    return pd.DataFrame(columns)
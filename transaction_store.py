@@ -0,0 +1,173 @@
+import json
+import sqlite3
+import threading
+import time
+
+import chain_sketches
+import config
+from transaction_normalizer import chain_key, iter_transactions, normalize
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    chain TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    from_address TEXT,
+    to_address TEXT,
+    value REAL,  -- Whole coins or tokens (Transaction.value), not base units like Transaction.amount
+    token TEXT,
+    timestamp INTEGER,
+    block INTEGER,
+    raw TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (chain, tx_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_transactions_from ON transactions (chain, from_address, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_to ON transactions (chain, to_address, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions (chain, timestamp);
+CREATE TABLE IF NOT EXISTS history_checkpoints (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (chain, address)
+);
+"""
+
+UPSERT_SQL = """
+    INSERT INTO transactions (chain, tx_hash, from_address, to_address, value, token, timestamp, block, raw, fetched_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (chain, tx_hash) DO UPDATE SET
+        block = COALESCE(excluded.block, block),
+        timestamp = COALESCE(timestamp, excluded.timestamp)
+"""
+
+SQL_VARIABLE_CHUNK = 900  # Stay under SQLite's bound-parameter limit in IN (...) lists
+
+_local = threading.local()
+
+
+def _get_connection():
+    """Return this thread's connection to the transaction store, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(config.TX_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _rename_amount_column(conn)
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _rename_amount_column(conn):
+    """Stores created before the rename call the whole-coin column "amount"; it holds the same values."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+    if "amount" in columns:
+        with conn:
+            conn.execute("ALTER TABLE transactions RENAME COLUMN amount TO value")
+
+
+def save_transactions(chain, transactions):
+    """Store raw explorer transactions for a chain; already-stored hashes are kept, not duplicated."""
+    chain = chain_key(chain)
+    now = time.time()
+    rows = []
+    records = []
+    for raw in transactions or []:
+        if isinstance(raw, dict):
+            tx = normalize(chain, raw)
+            records.append(tx)
+            rows.append((chain, tx.hash, tx.from_address, tx.to_address, tx.value, tx.token, tx.timestamp, tx.block,
+                         json.dumps(raw), now))
+    if not rows:
+        return 0
+    conn = _get_connection()
+    with conn:
+        known = set()
+        hashes = list({tx.hash for tx in records})
+        for start in range(0, len(hashes), SQL_VARIABLE_CHUNK):
+            chunk = hashes[start:start + SQL_VARIABLE_CHUNK]
+            known.update(row[0] for row in conn.execute(
+                f"SELECT tx_hash FROM transactions WHERE chain = ? AND tx_hash IN ({','.join('?' * len(chunk))})", [chain] + chunk))
+        conn.executemany(UPSERT_SQL, rows)
+
+    # Only first sightings feed the analytics sketches, so re-fetched pages are not counted twice
+    first_seen = {}
+    for tx in records:
+        if tx.hash not in known:
+            first_seen.setdefault(tx.hash, tx)
+    chain_sketches.record_transactions(first_seen.values())
+    return len(rows)
+
+
+def load_transactions(chain, address=None, role="any", start=None, end=None, limit=None):
+    """Return stored raw transactions for a chain, newest first.
+
+    :param address: only transactions sent ("from"), received ("to") or either ("any", per role) by this address
+    :param start: earliest unix timestamp to include
+    :param end: latest unix timestamp to include
+    """
+    conditions, params = _filters(chain, address, role, start, end)
+    sql = f"SELECT raw FROM transactions WHERE {' AND '.join(conditions)} ORDER BY timestamp DESC"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return [json.loads(row[0]) for row in _get_connection().execute(sql, params)]
+
+
+def iter_records(chain, address=None, role="any", start=None, end=None, oldest_first=False):
+    """Stream stored transactions as Transaction records, newest first, without materializing the whole result."""
+    conditions, params = _filters(chain, address, role, start, end)
+    sql = f"SELECT raw FROM transactions WHERE {' AND '.join(conditions)} ORDER BY timestamp {'ASC' if oldest_first else 'DESC'}"
+    rows = _get_connection().execute(sql, params)
+    return iter_transactions(chain, (json.loads(raw) for raw, in rows))
+
+
+def top_senders(chain, start=None, end=None, limit=10):
+    """Return (from_address, total_value, tx_count) for the biggest senders of the chain's native coin in a time range.
+
+    Token transfers are left out: their values are in other units and cannot be added to native ones.
+    """
+    conditions, params = _filters(chain, None, "any", start, end)
+    sql = f"""SELECT from_address, SUM(value) AS total, COUNT(*) FROM transactions
+              WHERE {' AND '.join(conditions)} AND from_address IS NOT NULL AND token IS NULL
+              GROUP BY from_address ORDER BY total DESC LIMIT ?"""
+    return _get_connection().execute(sql, params + [limit]).fetchall()
+
+
+def get_checkpoint(chain, address):
+    """Return the saved history-crawl state for a wallet, or None."""
+    row = _get_connection().execute(
+        "SELECT state FROM history_checkpoints WHERE chain = ? AND address = ?", (chain_key(chain), address)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_checkpoint(chain, address, state):
+    conn = _get_connection()
+    with conn:
+        conn.execute(
+            """INSERT INTO history_checkpoints (chain, address, state, updated_at) VALUES (?, ?, ?, ?)
+               ON CONFLICT (chain, address) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at""",
+            (chain_key(chain), address, json.dumps(state), time.time()),
+        )
+
+
+def _filters(chain, address, role, start, end):
+    conditions, params = ["chain = ?"], [chain_key(chain)]
+    if address is not None:
+        if role == "from":
+            conditions.append("from_address = ?")
+            params.append(address)
+        elif role == "to":
+            conditions.append("to_address = ?")
+            params.append(address)
+        else:
+            conditions.append("(from_address = ? OR to_address = ?)")
+            params += [address, address]
+    if start is not None:
+        conditions.append("timestamp >= ?")
+        params.append(int(start))
+    if end is not None:
+        conditions.append("timestamp <= ?")
+        params.append(int(end))
+    return conditions, params
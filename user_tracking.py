@@ -1,6 +1,6 @@
 import json
 import datetime
-from notifications import send_email_alert, send_telegram_alert, send_discord_alert
+from notifications import send_alert
 
 USER_DATA_FILE = "registered_users.json"
 
@@ -35,8 +35,6 @@ def register_new_user(username, wallet_address, blockchain):
 
     # Send alerts for new registration
     message = f"🆕 New User Registered!\n👤 **User:** {username}\n🔗 **Wallet:** {wallet_address}\n⏰ **Time:** {timestamp}\n🌐 **Blockchain:** {blockchain}"
-    send_email_alert("New User Registration", message)
-    send_telegram_alert(message)
-    send_discord_alert(message)
+    send_alert("New User Registration", message)
 
     return f"✅ User {username} registered successfully!"
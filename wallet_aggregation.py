@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+REPEATED_BUYER_MIN_TRANSACTIONS = 3  # More than two receipts makes a wallet a repeated buyer
+
+WALLET_COLUMNS = ["wallet_address", "total_received", "transaction_count"]
+
+
+def transactions_to_arrays(transactions):
+    """Split Transaction records into (hashes, receiving addresses, values) arrays, skipping unknown receivers."""
+    hashes, addresses, values = [], [], []
+    for tx in transactions:
+        if tx.to_address and tx.to_address != "Unknown":
+            hashes.append(tx.hash)
+            addresses.append(tx.to_address)
+            values.append(tx.value)
+    return np.array(hashes, dtype=object), np.array(addresses, dtype=object), np.array(values, dtype=np.float64)
+
+
+def aggregate_by_address(addresses, values, dust_value=None):
+    """Vectorized group-by on address: total received and transaction count per wallet.
+
+    With dust_value, also dust_free_received and dust_free_count over the transactions worth at least that much.
+    """
+    codes, uniques = pd.factorize(np.asarray(addresses, dtype=object))
+    values = np.asarray(values, dtype=np.float64)
+    totals = pd.DataFrame({
+        "wallet_address": uniques,
+        "total_received": np.bincount(codes, weights=values, minlength=len(uniques)),
+        "transaction_count": np.bincount(codes, minlength=len(uniques)),
+    })
+    if dust_value is not None:
+        kept = values >= dust_value
+        totals["dust_free_received"] = np.bincount(codes, weights=np.where(kept, values, 0.0), minlength=len(uniques))
+        totals["dust_free_count"] = np.bincount(codes[kept], minlength=len(uniques))
+    return totals
+
+
+def classify_wallets(wallets, min_received=None):
+    """Sort wallets (repeated buyers first, then by total received) and split them into new wallets and repeated buyers.
+
+    :param wallets: DataFrame with WALLET_COLUMNS
+    :param min_received: drop wallets that received less than this in total
+    :return: (all_wallets, potential_new_wallets, potential_repeated_buyers) DataFrames
+    """
+    if min_received is not None:
+        wallets = wallets[wallets["total_received"].to_numpy() >= min_received]
+    repeated = wallets["transaction_count"].to_numpy() >= REPEATED_BUYER_MIN_TRANSACTIONS
+    order = np.lexsort((-wallets["total_received"].to_numpy(), ~repeated))
+    wallets = wallets.iloc[order].reset_index(drop=True)
+    repeated = repeated[order]
+    return wallets, wallets[~repeated].reset_index(drop=True), wallets[repeated].reset_index(drop=True)
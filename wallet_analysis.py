@@ -1,8 +1,10 @@
-import requests
+import http_client
+import transaction_history
+import transaction_store
+from transaction_normalizer import chain_key, iter_transactions
 import json
 import time
 import pandas as pd
-import streamlit as st
 from notifications import send_email_alert, send_telegram_alert, send_discord_alert
 from dotenv import load_dotenv
 import os
@@ -42,65 +44,76 @@ def fetch_transactions(wallet_address, blockchain):
         headers = {"Authorization": f"Bearer {SOLANA_API_KEY}"}
 
     try:
-        response = requests.get(api_urls[blockchain.lower()], headers=headers)
+        response = http_client.get(api_urls[blockchain.lower()], headers=headers)
         response_json = response.json()
 
         print(f"🔍 API Response for {wallet_address} ({blockchain}):\n{json.dumps(response_json, indent=4)}")
 
         if blockchain.lower() in ["ethereum", "bsc"]:
-            return response_json.get("result", [])  # Extract transactions list
+            transactions = response_json.get("result", [])  # Extract transactions list
         elif blockchain.lower() == "solana":
-            return response_json.get("transactions", [])  # Adjust based on actual API response
+            transactions = response_json.get("transactions", [])  # Adjust based on actual API response
         elif blockchain.lower() == "bitcoin":
-            return response_json.get("txs", [])
+            transactions = response_json.get("txs", [])
+        else:
+            return []
 
-        return []
+        if isinstance(transactions, list):
+            transaction_store.save_transactions(blockchain, transactions)
+        return transactions
     except Exception as e:
         print(f"🚨 Error fetching transactions: {e}")
         return []
 
 
-def analyze_spending(wallet_address, blockchain, start_timestamp=None, end_timestamp=None):
-    """Detect suspicious spending patterns."""
-    transactions = fetch_transactions(wallet_address, blockchain)
-
-    if not isinstance(transactions, list) or len(transactions) == 0:
-        print(f"🚨 No transactions found for {wallet_address} on {blockchain}.")
-        return None
-
-    spending_data = []
-    frequent_small_trades = 0
-    repeated_token_trades = {}
-    large_spends = 0
-
-    transactions = transactions[:50]  # ✅ Safe slicing now
-
-    for tx in transactions:
-        timestamp = int(tx.get("timeStamp", 0) if "timeStamp" in tx else tx.get("time", 0))
+def analyze_spending(wallet_address, blockchain, start_timestamp=None, end_timestamp=None, offline=False):
+    """Detect suspicious spending patterns over a wallet's full history.
 
-        # Filter transactions by date range
-        if start_timestamp and end_timestamp and not (start_timestamp <= timestamp <= end_timestamp):
-            continue
-
-        # Handle Solana transactions (No `value` field)
-        if blockchain == "solana":
-            pre_balances = tx.get("transaction", {}).get("meta", {}).get("preBalances", [0])
-            post_balances = tx.get("transaction", {}).get("meta", {}).get("postBalances", [0])
-            amount = (pre_balances[0] - post_balances[0]) / 10**9  # Convert lamports to SOL
+    offline=True reads the local transaction store instead of the API. Returns None if the history
+    cannot be fetched or read, or has no transactions.
+    """
+    try:
+        if offline:
+            transactions = transaction_store.iter_records(blockchain, wallet_address, start=start_timestamp, end=end_timestamp)
+        elif chain_key(blockchain) in transaction_history.SUPPORTED_CHAINS:
+            # Resume from the wallet's checkpoint so only new pages are fetched; every page lands in
+            # the transaction store, which then holds the full history to analyze
+            for _ in transaction_history.iter_transaction_pages(wallet_address, blockchain, resume=True):
+                pass
+            transactions = transaction_store.iter_records(blockchain, wallet_address, start=start_timestamp, end=end_timestamp)
         else:
-            amount = float(tx.get("value", 0)) / 10**18 if blockchain != "bitcoin" else float(tx.get("value", 0))
-
-        token = tx.get("tokenSymbol", "Unknown") if "tokenSymbol" in tx else "Native"
-
-        spending_data.append({"Amount": amount, "Token": token, "Time": timestamp})
+            transactions = iter_transactions(blockchain, fetch_transactions(wallet_address, blockchain))
+
+        frequent_small_trades = 0
+        repeated_token_trades = {}
+        large_spends = 0
+        transaction_count = 0
+
+        for tx in transactions:
+            timestamp = tx.timestamp or 0
+
+            # Filter transactions by date range
+            if start_timestamp and end_timestamp and not (start_timestamp <= timestamp <= end_timestamp):
+                continue
+            transaction_count += 1
+
+            amount = tx.value
+            token = tx.token or "Native"
+
+            if amount < 0.01:
+                frequent_small_trades += 1
+            if token not in repeated_token_trades:
+                repeated_token_trades[token] = 0
+            repeated_token_trades[token] += 1
+            if amount > 10:
+                large_spends += 1
+    except Exception as e:
+        print(f"🚨 Error analyzing spending for {wallet_address} on {blockchain}: {e}")
+        return None
 
-        if amount < 0.01:
-            frequent_small_trades += 1
-        if token not in repeated_token_trades:
-            repeated_token_trades[token] = 0
-        repeated_token_trades[token] += 1
-        if amount > 10:
-            large_spends += 1
+    if transaction_count == 0:
+        print(f"🚨 No transactions found for {wallet_address} on {blockchain}.")
+        return None
 
     # Store analysis results
     spending_patterns = load_spending_patterns()
@@ -1,11 +1,8 @@
-import streamlit as st  # Streamlit must be imported first
-st.set_page_config(page_title="Automated Wallet Monitoring", layout="wide")  # Must be the first Streamlit command
-
-
 import requests
+import http_client
 import json
 from datetime import datetime
-from notifications import send_email_alert, send_telegram_alert, send_discord_alert
+from notifications import send_alert
 
 # Example API Endpoints (Replace with actual APIs)
 SOLANA_NEW_WALLETS_API = "https://api.solana.com/getNewWallets"
@@ -35,7 +32,7 @@ def check_new_wallets(blockchain):
         return []
 
     try:
-        response = requests.get(url, timeout=10)  # Add timeout to prevent hanging requests
+        response = http_client.get(url, timeout=10)  # Add timeout to prevent hanging requests
         response.raise_for_status()  # Raise error for HTTP failures
         data = response.json()
         return data.get("new_wallets", [])
@@ -68,9 +65,7 @@ def detect_new_wallet_activity():
             
             if first_funds:
                 message = f"🆕 **New Wallet Alert!**\n🔗 Wallet: {wallet}\n💰 First Funds: {first_funds['amount']}\n📅 Date: {first_funds['timestamp']}"
-                send_email_alert("New Wallet Alert", message)
-                send_telegram_alert(message)
-                send_discord_alert(message)
+                send_alert("New Wallet Alert", message)
                 detected_wallets.append(first_funds)
 
     return detected_wallets
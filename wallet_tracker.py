@@ -1,8 +1,14 @@
-import requests
-import sqlite3
+import http_client
+import transaction_store
+from transaction_normalizer import iter_transactions, raw_transactions
+from wallet_aggregation import classify_wallets, transactions_to_arrays
 import os
-from datetime import datetime
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+import config
+import database
+from seen_filter import get_seen_set
 
 load_dotenv()
 
@@ -17,113 +23,242 @@ BLOCKCHAIN_APIS = {
     "binance smart chain": f"https://api.bscscan.com/api?module=account&action=txlist&sort=desc&apikey={BSCSCAN_API_KEY}&address="
 }
 
-DB_PATH = "wallet_tracking.db"
+# Chains whose feed is a mempool snapshot rather than a cursor-able history
+MEMPOOL_CHAINS = {"bitcoin"}
 
-def initialize_database():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    cursor = conn.cursor()
-    cursor.execute('''CREATE TABLE IF NOT EXISTS wallets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        wallet_address TEXT UNIQUE,
-        blockchain TEXT,
-        total_received REAL,
-        transaction_count INTEGER,
-        last_updated TIMESTAMP
-    )''')
-    conn.commit()
-    conn.close()
+BALANCE_APIS = {
+    "bitcoin": "https://blockchain.info/balance",
+    "solana": "https://api.mainnet-beta.solana.com",
+    "ethereum": "https://api.etherscan.io/api",
+    "binance smart chain": "https://api.bscscan.com/api"
+}
 
-initialize_database()
+# Maximum addresses per provider batch request
+BALANCE_BATCH_SIZES = {
+    "bitcoin": 100,
+    "solana": 100,  # getMultipleAccounts limit
+    "ethereum": 20,  # balancemulti limit
+    "binance smart chain": 20
+}
 
-def get_wallet_balance(wallet_address, blockchain):
+BALANCE_API_KEYS = {
+    "ethereum": ETHERSCAN_API_KEY,
+    "binance smart chain": BSCSCAN_API_KEY
+}
+
+def _fetch_bitcoin_balances(addresses):
+    response = http_client.get(BALANCE_APIS["bitcoin"], params={"active": "|".join(addresses)})
+    response.raise_for_status()
+    data = response.json()
+    results = {}
+    for address in addresses:
+        if address in data:
+            results[address] = {"balance": data[address].get("final_balance", 0) / 1e8, "error": None}
+        else:
+            results[address] = {"balance": None, "error": "Address not found in response"}
+    return results
+
+def _fetch_evm_balances(addresses, blockchain):
+    params = {
+        "module": "account",
+        "action": "balancemulti",
+        "address": ",".join(addresses),
+        "tag": "latest",
+        "apikey": BALANCE_API_KEYS[blockchain]
+    }
+    response = http_client.get(BALANCE_APIS[blockchain], params=params)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") != "1" or not isinstance(data.get("result"), list):
+        error = str(data.get("result") or data.get("message", "Unknown error"))
+        return {address: {"balance": None, "error": error} for address in addresses}
+
+    balances = {entry.get("account", "").lower(): entry.get("balance") for entry in data["result"]}
+    results = {}
+    for address in addresses:
+        balance = balances.get(address.lower())
+        if balance is None:
+            results[address] = {"balance": None, "error": "Address not found in response"}
+        else:
+            results[address] = {"balance": int(balance) / 1e18, "error": None}
+    return results
+
+def _fetch_solana_balances(addresses):
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getMultipleAccounts",
+        "params": [addresses, {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}}]
+    }
+    response = http_client.post(BALANCE_APIS["solana"], json=payload, retry_post=True)  # Read-only RPC
+    response.raise_for_status()
+    data = response.json()
+    if "error" in data:
+        error = data["error"].get("message", "Unknown error")
+        return {address: {"balance": None, "error": error} for address in addresses}
+
+    accounts = data.get("result", {}).get("value", [])
+    results = {}
+    for address, account in zip(addresses, accounts):
+        # Accounts that were never funded come back as null
+        lamports = account.get("lamports", 0) if account else 0
+        results[address] = {"balance": lamports / 1e9, "error": None}
+    for address in addresses[len(accounts):]:
+        results[address] = {"balance": None, "error": "Address not found in response"}
+    return results
+
+def _fetch_balance_chunk(addresses, blockchain):
     try:
         if blockchain == "bitcoin":
-            url = f"https://blockchain.info/balance?active={wallet_address}"
+            return _fetch_bitcoin_balances(addresses)
         elif blockchain == "solana":
-            url = "https://api.mainnet-beta.solana.com"
-            payload = {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": [wallet_address]}
-            response = requests.post(url, json=payload).json()
-            return response.get("result", {}).get("value", 0) / 1e9
-        elif blockchain in ["ethereum", "binance smart chain"]:
-            url = BLOCKCHAIN_APIS[blockchain] + wallet_address
-        else:
-            return None
-        
-        response = requests.get(url).json()
-        return int(response.get("result", 0)) / 1e18
+            return _fetch_solana_balances(addresses)
+        return _fetch_evm_balances(addresses, blockchain)
     except Exception as e:
-        print(f"Error fetching {blockchain} balance: {e}")
+        print(f"Error fetching {blockchain} balances: {e}")
+        return {address: {"balance": None, "error": str(e)} for address in addresses}
+
+def get_wallet_balances(addresses, blockchain, max_workers=None):
+    """Fetch balances for many addresses using each provider's batch endpoint.
+
+    Returns a dict mapping each address to {"balance": float or None, "error": str or None}.
+    """
+    if blockchain not in BALANCE_APIS:
+        return {address: {"balance": None, "error": f"Unsupported blockchain: {blockchain}"} for address in addresses}
+
+    unique_addresses = list(dict.fromkeys(addresses))
+    batch_size = BALANCE_BATCH_SIZES[blockchain]
+    chunks = [unique_addresses[i:i + batch_size] for i in range(0, len(unique_addresses), batch_size)]
+    if not chunks:
+        return {}
+
+    results = {}
+    workers = min(max_workers or config.BALANCE_MAX_WORKERS, len(chunks))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk_results in executor.map(lambda chunk: _fetch_balance_chunk(chunk, blockchain), chunks):
+            results.update(chunk_results)
+    return results
+
+def get_wallet_balance(wallet_address, blockchain):
+    result = get_wallet_balances([wallet_address], blockchain).get(wallet_address)
+    if not result or result["error"]:
         return None
+    return result["balance"]
 
 
-# Function to Detect and Identify Wallets
-def detect_and_identify_wallets(blockchain, max_wallets=150, filter_type="all", skip_demo=False):
+def _beyond_cursor(tx, cursor):
+    """True if a transaction is not older than the chain's cursor (ties are left to tx-hash dedup)."""
+    if cursor is None:
+        return True
+    if tx.block is not None and cursor["last_block"] is not None:
+        return tx.block >= cursor["last_block"]
+    if tx.timestamp is not None and cursor["last_timestamp"] is not None:
+        return tx.timestamp >= cursor["last_timestamp"]
+    return True
+
+
+def ingest_new_transactions(blockchain):
+    """Ingest the explorer's transactions past this chain's cursor into the wallet totals.
+
+    Returns the number of new transactions, or None if the chain is unsupported or the request failed.
+    """
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-        cursor = conn.cursor()
-        
         url = BLOCKCHAIN_APIS.get(blockchain.lower())
         if not url:
             print(f"Unsupported blockchain: {blockchain}")
-            return {}
+            return None
+
+        cursor = database.get_ingestion_cursor(blockchain)
+        if cursor and cursor["last_block"] is not None and blockchain in ("ethereum", "binance smart chain"):
+            url += f"&startblock={cursor['last_block']}"  # Let the explorer skip what we already have
 
-        response = requests.get(url)
+        response = http_client.get(url)
         if response.status_code != 200:
             print(f"API request failed for {blockchain} with status {response.status_code}")
-            return {}
+            return None
+
+        raw = raw_transactions(response.json())
+        seen_set = None
+        if blockchain in MEMPOOL_CHAINS:
+            # Unconfirmed transactions have no block and arrive out of timestamp order, so the cursor
+            # would drop late arrivals; mempool chains rely on the seen set and tx-hash dedup instead
+            cursor = None
+            # Each mempool snapshot mostly repeats the last one; only unseen hashes go further
+            seen_set = get_seen_set(f"wallet_tracker:{blockchain}")
+            raw = seen_set.filter_new(raw)
+        try:
+            transaction_store.save_transactions(blockchain, raw)
+            transactions = [tx for tx in iter_transactions(blockchain, raw) if _beyond_cursor(tx, cursor)]
+            new_count = 0
+            if transactions:
+                newest = max(transactions, key=lambda tx: (tx.block or 0, tx.timestamp or 0))
+                new_cursor = {"last_tx_hash": newest.hash, "last_block": newest.block, "last_timestamp": newest.timestamp}
+                new_count = database.ingest_wallet_transactions(blockchain, *transactions_to_arrays(transactions), new_cursor)
+                print(f"Ingested {new_count} new transactions for {blockchain}.")
+        except Exception:
+            if seen_set is not None:
+                seen_set.discard(raw)  # Not ingested, so the next snapshot must not skip them
+            raise
+        return new_count
+    except Exception as e:
+        print(f"Error ingesting transactions on {blockchain}: {e}")
+        return None
+
+
+def load_tracked_wallets(blockchain, max_wallets=150, skip_demo=False):
+    """The chain's most recently active wallets and their accumulated totals, most recent first (database only).
+
+    With skip_demo, totals leave out receipts below config.DUST_TRANSACTION_VALUE and dust-only wallets are dropped.
+    """
+    wallets = pd.DataFrame([row[1:5] for row in database.fetch_recent_wallets(blockchain, max_wallets, skip_dust=skip_demo)],
+                           columns=["wallet_address", "blockchain", "total_received", "transaction_count"])
+    wallets = wallets.fillna({"total_received": 0.0, "transaction_count": 0})
+    return wallets[["wallet_address", "total_received", "transaction_count", "blockchain"]]
+
+
+def identify_wallets(wallets, filter_type="all"):
+    """Split a load_tracked_wallets() frame into all, new and repeated-buyer wallets.
 
-        response = response.json()
-        wallets = {}
-        
-        transactions = response.get("txs", [])[:max_wallets] if blockchain == "bitcoin" else response.get("result", [])[:max_wallets]
-        if not transactions:
+    Returns DataFrames under "all_wallets", "potential_new_wallets" and "potential_repeated_buyers",
+    or {} when no wallet is left.
+    """
+    sorted_wallets, potential_new_wallets, potential_repeated_buyers = classify_wallets(wallets)
+    if sorted_wallets.empty:
+        return {}
+
+    if filter_type == "new":
+        sorted_wallets = potential_new_wallets
+    elif filter_type == "potential":
+        sorted_wallets = potential_repeated_buyers
+
+    return {
+        "all_wallets": sorted_wallets,
+        "potential_new_wallets": potential_new_wallets,
+        "potential_repeated_buyers": potential_repeated_buyers
+    }
+
+
+def classify_tracked_wallets(blockchain, max_wallets=150, filter_type="all", skip_demo=False):
+    """Classify the chain's most recently active wallets on their accumulated totals (database only, no API calls).
+
+    Returns DataFrames under "all_wallets", "potential_new_wallets" and "potential_repeated_buyers".
+    """
+    try:
+        wallet_data = identify_wallets(load_tracked_wallets(blockchain, max_wallets, skip_demo), filter_type)
+        if not wallet_data:
             print(f"No transactions found for {blockchain}.")
-            return {}
-
-        for tx in transactions:
-            address = tx.get("to") if blockchain != "bitcoin" else next((out.get("addr") for out in tx.get("out", [])), None)
-            value = float(tx.get("value", 0)) / 1e18 if blockchain != "bitcoin" else sum(out.get("value", 0) for out in tx.get("out", [])) / 1e8
-            if address and address != "Unknown":
-                if skip_demo and value < 0.01:
-                    continue
-                if address not in wallets:
-                    wallets[address] = {"total_received": value, "transaction_count": 1}
-                else:
-                    wallets[address]["total_received"] += value
-                    wallets[address]["transaction_count"] += 1
-
-        wallet_data_list = [
-            {
-                "wallet_address": w,
-                "total_received": v["total_received"],
-                "transaction_count": v["transaction_count"],
-                "blockchain": blockchain
-            }
-            for w, v in wallets.items()
-        ]
-
-        sorted_wallets = sorted(wallet_data_list, key=lambda x: (x["transaction_count"] > 2, x["total_received"]), reverse=True)
-        potential_new_wallets = [w for w in sorted_wallets if w["transaction_count"] <= 2]
-        potential_repeated_buyers = [w for w in sorted_wallets if w["transaction_count"] > 2]
-
-        if filter_type == "new":
-            sorted_wallets = potential_new_wallets
-        elif filter_type == "potential":
-            sorted_wallets = potential_repeated_buyers
-
-        for wallet in sorted_wallets:
-            cursor.execute('''INSERT OR REPLACE INTO wallets (wallet_address, blockchain, total_received, transaction_count, last_updated)
-                              VALUES (?, ?, ?, ?, ?)''',
-                           (wallet["wallet_address"], wallet["blockchain"], wallet["total_received"], wallet["transaction_count"], datetime.now()))
-
-        conn.commit()
-        conn.close()
-
-        return {
-            "all_wallets": sorted_wallets,
-            "potential_new_wallets": potential_new_wallets,
-            "potential_repeated_buyers": potential_repeated_buyers
-        }
+        return wallet_data
     except Exception as e:
-        print(f"Error detecting wallets on {blockchain}: {e}")
-        return {} 
\ No newline at end of file
+        print(f"Error classifying wallets on {blockchain}: {e}")
+        return {}
+
+
+# Function to Detect and Identify Wallets
+def detect_and_identify_wallets(blockchain, max_wallets=150, filter_type="all", skip_demo=False):
+    """Ingest the explorer's transactions past this chain's cursor, then classify wallets on their accumulated totals.
+
+    Returns DataFrames under "all_wallets", "potential_new_wallets" and "potential_repeated_buyers".
+    """
+    if ingest_new_transactions(blockchain) is None:
+        return {}
+    return classify_tracked_wallets(blockchain, max_wallets, filter_type, skip_demo)